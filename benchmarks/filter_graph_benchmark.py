@@ -0,0 +1,88 @@
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+
+from synthetic_media import generate_media
+
+from silence_remover.silence_detector import SilenceDetector
+from silence_remover.filter_generator import FilterGenerator
+
+
+def render(input_filename, filter_lines, output_filename):
+    with tempfile.NamedTemporaryFile("w+", suffix=".txt", delete=False) as f:
+        f.write(";\n".join(filter_lines))
+        filter_filename = f.name
+
+    process = subprocess.Popen(
+        ["ffmpeg", "-y", "-i", input_filename,
+         "-filter_complex_script", filter_filename,
+         "-map", "[vout]", "-map", "[aout]",
+         "-c:v", "libx264", "-preset", "ultrafast",
+         output_filename],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+
+    start_time = time.perf_counter()
+    _, status, rusage = os.wait4(process.pid, 0)
+    elapsed_time = time.perf_counter() - start_time
+    process.returncode = os.waitstatus_to_exitcode(status)
+
+    os.remove(filter_filename)
+
+    return {
+        "returncode": process.returncode,
+        "wall_time": elapsed_time,
+        "max_rss_kb": rusage.ru_maxrss,
+        "filter_script_bytes": len(";\n".join(filter_lines))
+    }
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description="Compare filter graph strategies of FilterGenerator")
+    argument_parser.add_argument("--duration", type=float, default=600)
+    argument_parser.add_argument("--cut-period", type=float, default=1.0)
+    argument_parser.add_argument("--output", default="filter_graph_benchmark.json")
+    arguments = argument_parser.parse_args()
+
+    working_directory = tempfile.mkdtemp()
+    try:
+        input_filename = os.path.join(working_directory, "input.mp4")
+        generate_media(input_filename, duration=arguments.duration,
+                       burst_time=arguments.cut_period * 0.6, silence_time=arguments.cut_period * 0.4)
+
+        detector = SilenceDetector(input_filename)
+        detector.detect(silence_time_threshold=arguments.cut_period * 0.3)
+        intervals = detector.parse(short_interval_threshold=0.1, stretch_time=0.05)
+
+        results = {
+            "duration": arguments.duration,
+            "cut_period": arguments.cut_period,
+            "intervals": len(intervals),
+            "strategies": {}
+        }
+
+        for strategy in ("per_interval", "grouped"):
+            generator = FilterGenerator(intervals)
+            generator.generate(graph_strategy=strategy)
+
+            result = render(input_filename, generator.get_filter()["filter_lines"],
+                            os.path.join(working_directory, f"{strategy}.mp4"))
+            result["throughput"] = arguments.duration / result["wall_time"]
+            results["strategies"][strategy] = result
+
+            print(f"{strategy}: {result['wall_time']:.2f}s, {result['throughput']:.2f}x realtime, "
+                  f"{result['max_rss_kb'] / 1024:.1f} MiB max RSS")
+    finally:
+        shutil.rmtree(working_directory)
+
+    with open(arguments.output, "w+") as f:
+        f.write(json.dumps(results, indent=4))
+
+
+if __name__ == "__main__":
+    main()
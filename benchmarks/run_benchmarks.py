@@ -0,0 +1,150 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import tempfile
+import time
+
+from synthetic_media import generate_media, generate_console_output
+
+from silence_remover.silence_detector import SilenceDetector, IntervalParser
+from silence_remover.filter_generator import FilterGenerator
+from silence_remover.media_editor import MediaEditor
+
+
+def timed(function, *args, **kwargs):
+    start_time = time.perf_counter()
+    result = function(*args, **kwargs)
+
+    return result, time.perf_counter() - start_time
+
+
+def post_process(parser):
+    return (
+        parser
+        .insert_additional_intervals()
+        .mark_short_intervals(short_interval_threshold=0.3)
+        .combine_and_remove_intervals()
+        .stretch_audible_intervals(stretch_time=0.25)
+        .get_intervals()
+    )
+
+
+def benchmark_parser(line_counts):
+    results = []
+
+    for line_count in line_counts:
+        console_output = generate_console_output(line_count)
+
+        parser, parse_time = timed(IntervalParser(console_output).parse_console_output)
+        silent_intervals, media_duration = parser.get_intervals(), parser.media_duration
+        _, post_process_time = timed(post_process, IntervalParser().load_intervals(silent_intervals, media_duration))
+
+        result = {
+            "lines": line_count,
+            "parse_time": parse_time,
+            "post_process_time": post_process_time,
+            "lines_per_second": line_count / parse_time if parse_time > 0 else None
+        }
+
+        try:
+            from silence_remover.silence_detector.interval_array import IntervalArray
+        except ImportError:
+            pass
+        else:
+            _, result["array_post_process_time"] = timed(
+                post_process, IntervalArray.from_intervals(silent_intervals, media_duration)
+            )
+
+        results.append(result)
+        print(f"parser {line_count} lines: parse {parse_time:.3f}s, post-process {post_process_time:.3f}s")
+
+    return results
+
+
+def benchmark_pipeline(working_directory, duration, burst_time, silence_time, segment_count, workers):
+    input_filename = os.path.join(working_directory, f"input_{duration}_{burst_time}_{silence_time}.mp4")
+    _, generate_time = timed(generate_media, input_filename, duration=duration,
+                             burst_time=burst_time, silence_time=silence_time)
+
+    detector = SilenceDetector(input_filename)
+    _, detect_time = timed(detector.detect)
+    intervals, parse_time = timed(detector.parse, segment_count=segment_count)
+
+    generator = FilterGenerator(intervals, segmented=True)
+    _, filter_time = timed(generator.generate)
+
+    editor = MediaEditor()
+    editor.set_editor_options(generator.get_filter(), input_filename,
+                              os.path.join(working_directory, "segment{segment}.mp4"))
+    _, edit_time = timed(editor.edit, workers=workers)
+    _, combine_time = timed(editor.combine, os.path.join(working_directory, "segment{segment}.mp4"),
+                            os.path.join(working_directory, "output.mp4"))
+
+    result = {
+        "duration": duration,
+        "burst_time": burst_time,
+        "silence_time": silence_time,
+        "cuts": sum(len(segment) for segment in intervals),
+        "segments": len(intervals),
+        "workers": workers,
+        "media_generation_time": generate_time,
+        "stages": {
+            "detect": detect_time,
+            "parse": parse_time,
+            "generate": filter_time,
+            "edit": edit_time,
+            "combine": combine_time
+        }
+    }
+    result["detect_throughput"] = duration / detect_time
+    result["edit_throughput"] = duration / edit_time
+
+    print(f"pipeline {duration}s @ {burst_time}/{silence_time}: " +
+          ", ".join(f"{stage} {stage_time:.3f}s" for stage, stage_time in result["stages"].items()))
+
+    return result
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description="Stage-level benchmarks on synthetic media")
+    argument_parser.add_argument("--durations", type=float, nargs="+", default=[60, 300])
+    argument_parser.add_argument("--burst-times", type=float, nargs="+", default=[0.6, 3.0])
+    argument_parser.add_argument("--silence-time", type=float, default=0.8)
+    argument_parser.add_argument("--segments", type=int, default=4)
+    argument_parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    argument_parser.add_argument("--parser-lines", type=int, nargs="+", default=[1000, 100000, 1000000])
+    argument_parser.add_argument("--skip-media", action="store_true")
+    argument_parser.add_argument("--output", default="benchmark_results.json")
+    arguments = argument_parser.parse_args()
+
+    results = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": {
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count()
+        },
+        "parser": benchmark_parser(arguments.parser_lines),
+        "pipeline": []
+    }
+
+    if not arguments.skip_media:
+        working_directory = tempfile.mkdtemp()
+        try:
+            for duration in arguments.durations:
+                for burst_time in arguments.burst_times:
+                    results["pipeline"].append(benchmark_pipeline(
+                        working_directory, duration, burst_time, arguments.silence_time,
+                        arguments.segments, arguments.workers
+                    ))
+        finally:
+            shutil.rmtree(working_directory)
+
+    with open(arguments.output, "w+") as f:
+        f.write(json.dumps(results, indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import subprocess
+
+
+def generate_media(filename, duration=60, burst_time=0.6, silence_time=0.4, noise=False, video=True,
+                   size="640x360", rate=30):
+    period = burst_time + silence_time
+    audio_source = f"anoisesrc=color=pink:sample_rate=48000:duration={duration}" if noise \
+        else f"sine=frequency=220:sample_rate=48000:duration={duration}"
+
+    # Bursts are gated by the position inside each period and slightly modulated to resemble speech
+    audio_filter = (
+        f"volume='lt(mod(t,{period}),{burst_time})*(0.6+0.4*sin(2*PI*4*t))':eval=frame"
+    )
+
+    command = ["ffmpeg", "-y"]
+
+    if video:
+        command.extend(["-f", "lavfi", "-i", f"testsrc2=size={size}:rate={rate}:duration={duration}"])
+
+    command.extend(["-f", "lavfi", "-i", audio_source, "-af", audio_filter])
+
+    if video:
+        command.extend(["-c:v", "libx264", "-preset", "ultrafast", "-pix_fmt", "yuv420p"])
+
+    command.extend(["-c:a", "aac", "-shortest", filename])
+
+    subprocess.run(command, capture_output=True, check=True)
+
+    return filename
+
+
+def generate_console_output(line_count, burst_time=0.6, silence_time=0.4):
+    period = burst_time + silence_time
+    interval_count = line_count // 2
+    duration = interval_count * period
+
+    hours, remainder = divmod(duration, 3600)
+    minutes, seconds = divmod(remainder, 60)
+
+    lines = [f"  Duration: {int(hours):02d}:{int(minutes):02d}:{seconds:05.2f}, start: 0.000000, bitrate: 128 kb/s"]
+
+    for i in range(interval_count):
+        start = round(i * period + burst_time, 6)
+        end = round((i + 1) * period, 6)
+        lines.append(f"[silencedetect @ 0x55d0c8a3f2c0] silence_start: {start}")
+        lines.append(f"[silencedetect @ 0x55d0c8a3f2c0] silence_end: {end} | silence_duration: {round(end - start, 6)}")
+
+    return lines
@@ -14,6 +14,14 @@ setuptools.setup(
     long_description_content_type="text/markdown",
     url='https://github.com/lagmoellertim/silence-remover',
     packages=setuptools.find_packages(),
+    extras_require={
+        "numpy": ["numpy"],
+    },
+    entry_points={
+        "console_scripts": [
+            "silence-remover=silence_remover.cli:main",
+        ],
+    },
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
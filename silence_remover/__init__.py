@@ -1,4 +1,6 @@
 from silence_remover.silence_remover import SilenceRemover
+from silence_remover.async_silence_remover import AsyncSilenceRemover
 from silence_remover import silence_detector
 from silence_remover import filter_generator
 from silence_remover import media_editor
+from silence_remover.live_silence_remover import LiveSilenceRemover
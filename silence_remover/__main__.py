@@ -0,0 +1,5 @@
+import sys
+
+from silence_remover.cli import main
+
+sys.exit(main())
@@ -0,0 +1,174 @@
+import asyncio
+import codecs
+import os
+import re
+
+from silence_remover.silence_detector import SilenceDetector, IntervalParser
+from silence_remover.filter_generator import FilterGenerator
+from silence_remover.media_editor import MediaEditor
+from silence_remover.media_editor.pipe_io import resolve_input, open_pipe_files, start_pipe_files, \
+    close_pipe_files
+
+
+class AsyncSilenceRemover:
+    def __init__(self, input_filename, output_filename, segmented=False, segment_interval_time=-1,
+                 segment_count=-1, semaphore=None, timeout=None, stream_format="matroska"):
+        self.input_filename, self.spooled_input_filename = resolve_input(input_filename)
+        self.output_filename = output_filename
+        self.stream_format = stream_format
+
+        self.segmented = segmented or segment_count > 0
+        self.segment_interval_time = segment_interval_time
+        self.segment_count = segment_count
+
+        self.semaphore = semaphore or asyncio.Semaphore(os.cpu_count() or 1)
+        self.timeout = timeout
+
+        self.parsed_result = None
+        self.render_results = []
+
+        self.detector = SilenceDetector(self.input_filename)
+        self.generator = None
+        self.editor = MediaEditor()
+
+    async def __run_process(self, command, on_line=None, timeout=None, temp_files=()):
+        async with self.semaphore:
+            command, pass_fds = open_pipe_files(command, temp_files)
+            process = await asyncio.create_subprocess_exec(
+                *command,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE,
+                pass_fds=pass_fds
+            )
+            start_pipe_files(temp_files)
+
+            console_output = []
+
+            def handle_line(line):
+                console_output.append(line)
+
+                if on_line is not None:
+                    on_line(line)
+
+            async def read_console_output():
+                # FFmpeg ends its stats lines with "\r" only, so lines are split manually instead of by readline
+                decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+                remainder = ""
+
+                while True:
+                    chunk = await process.stderr.read(64 * 1024)
+                    if not chunk:
+                        break
+
+                    lines = re.split(r"\r\n|\r|\n", remainder + decoder.decode(chunk))
+                    remainder = lines.pop()
+                    for line in lines:
+                        handle_line(line)
+
+                remainder += decoder.decode(b"", final=True)
+                if remainder:
+                    handle_line(remainder)
+
+                await process.wait()
+
+            try:
+                await asyncio.wait_for(read_console_output(), timeout or self.timeout)
+            except BaseException:
+                if process.returncode is None:
+                    process.kill()
+                    await process.wait()
+                raise
+
+        return process.returncode, console_output
+
+    async def detect_silence(self, silence_level_db=-35, silence_time_threshold=0.5, audio_track=0,
+                             analysis_channels=None, analysis_sample_rate=None, timeout=None, **kwargs):
+        parser = IntervalParser()
+        command = self.detector.generate_command(
+            silence_level_db=silence_level_db,
+            silence_time_threshold=silence_time_threshold,
+            audio_track=audio_track,
+            analysis_channels=analysis_channels,
+            analysis_sample_rate=analysis_sample_rate
+        )
+
+        returncode, _ = await self.__run_process(command, on_line=parser.feed_line, timeout=timeout)
+        if returncode != 0:
+            raise Exception(f"FFmpeg exited with code {returncode} while detecting silence.")
+
+        self.detector.silent_intervals = parser.get_intervals()
+        self.detector.media_duration = parser.media_duration
+
+        return self.retune_silence(**kwargs)
+
+    def retune_silence(self, **kwargs):
+        self.parsed_result = self.detector.parse(split_intervals=self.segment_interval_time,
+                                                 segment_count=self.segment_count, **kwargs)
+
+        return self.parsed_result
+
+    def generate_silence_filter(self, custom_flags="", **kwargs):
+        self.generator = FilterGenerator(self.parsed_result, segmented=self.segmented)
+        self.generator.generate(**kwargs)
+        self.editor.set_editor_options(self.generator.get_filter(), self.input_filename, self.output_filename,
+                                       custom_flags=custom_flags, stream_format=self.stream_format)
+
+    async def __run_job(self, key, command, temp_files, timeout):
+        try:
+            returncode, console_output = await self.__run_process(command, timeout=timeout, temp_files=temp_files)
+        finally:
+            await asyncio.get_running_loop().run_in_executor(None, close_pipe_files, temp_files)
+
+        result = {
+            "key": key,
+            "returncode": returncode,
+            "console_output": console_output
+        }
+        self.render_results.append(result)
+
+        if returncode != 0:
+            raise Exception(f"FFmpeg exited with code {returncode} while rendering {key}.")
+
+        return result
+
+    async def remove_silence(self, segment=-1, threads=None, timeout=None):
+        self.render_results = []
+        tasks = [
+            asyncio.ensure_future(self.__run_job(key, command, temp_files, timeout))
+            for key, command, temp_files in self.editor.prepare_jobs(segment=segment, threads=threads)
+        ]
+
+        try:
+            done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        except asyncio.CancelledError:
+            done, pending = set(), set(tasks)
+            raise
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        for task in tasks:
+            if task in done and task.exception() is not None:
+                raise task.exception()
+
+        return [task.result() for task in tasks]
+
+    async def combine_segments(self, output_file, re_encode=False, timeout=None):
+        command, temp_files = self.editor.prepare_combine(self.output_filename, output_file, re_encode=re_encode,
+                                                          stream_format=self.stream_format)
+
+        try:
+            returncode, console_output = await self.__run_process(command, timeout=timeout, temp_files=temp_files)
+        finally:
+            await asyncio.get_running_loop().run_in_executor(None, close_pipe_files, temp_files)
+
+        if returncode != 0:
+            raise Exception(f"FFmpeg exited with code {returncode} while combining segments.")
+
+        return console_output
+
+    def close(self):
+        if self.spooled_input_filename is not None:
+            os.remove(self.spooled_input_filename)
+            self.spooled_input_filename = None
@@ -0,0 +1,214 @@
+import hashlib
+import json
+import os
+import platform
+import re
+import shutil
+import subprocess
+import tempfile
+import time
+
+from silence_remover.silence_detector import SegmentPlanner
+from silence_remover.filter_generator import FilterGenerator
+from silence_remover.media_editor import MediaEditor
+
+
+class AutoTuner:
+    def __init__(self, input_filename, intervals, sample_time=30.0, segment_counts=None, threads=None, presets=None,
+                 min_psnr=40.0, cache_filename=None):
+        cpu_count = os.cpu_count() or 1
+
+        self.input_filename = input_filename
+        self.intervals = intervals
+        self.sample_time = sample_time
+        self.segment_counts = segment_counts or sorted({1, max(1, cpu_count // 2), cpu_count})
+        self.threads = threads or [None, 1]
+        self.presets = presets or [[], ["-preset", "veryfast"], ["-preset", "ultrafast"]]
+        self.min_psnr = min_psnr
+        self.cache_filename = cache_filename or os.path.join(os.path.expanduser("~"), ".cache", "silence_remover",
+                                                             "autotune.json")
+
+        self.results = []
+
+    def __probe_video_stream(self):
+        process = subprocess.run(
+            ["ffprobe", "-v", "error", "-select_streams", "v:0",
+             "-show_entries", "stream=codec_name,width,height", "-of", "json", self.input_filename],
+            capture_output=True,
+            text=True
+        )
+
+        try:
+            streams = json.loads(process.stdout)["streams"]
+        except (ValueError, KeyError):
+            return None
+
+        return streams[0] if streams else None
+
+    def get_cache_key(self, filter_options):
+        ffmpeg_version = subprocess.run(["ffmpeg", "-version"], capture_output=True, text=True).stdout
+
+        # The minimum PSNR is left out, cached results are filtered again with the current one
+        key_data = {
+            "host": platform.node(),
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+            "ffmpeg": ffmpeg_version.split("\n")[0],
+            "video_stream": self.__probe_video_stream(),
+            "sample_time": self.sample_time,
+            "candidates": self.get_candidates(),
+            "filter_options": filter_options
+        }
+
+        return hashlib.sha256(json.dumps(key_data, sort_keys=True).encode()).hexdigest()
+
+    def __load_cache(self):
+        try:
+            with open(self.cache_filename, "r") as f:
+                return json.loads(f.read())
+        except (OSError, ValueError):
+            return {}
+
+    def __store_cache(self, cache):
+        os.makedirs(os.path.dirname(self.cache_filename), exist_ok=True)
+
+        temp_filename = f"{self.cache_filename}.tmp"
+        with open(temp_filename, "w") as f:
+            f.write(json.dumps(cache))
+        os.replace(temp_filename, self.cache_filename)
+
+    def get_sample_intervals(self):
+        media_duration = self.intervals[-1]["end"] if self.intervals else 0.0
+
+        # The sample is taken from the middle, the start and end of recordings are rarely representative
+        sample_start = max(0.0, (media_duration - self.sample_time) / 2)
+        sample_end = min(media_duration, sample_start + self.sample_time)
+
+        sample_intervals = []
+        for interval in self.intervals:
+            start, end = max(interval["start"], sample_start), min(interval["end"], sample_end)
+            if end > start:
+                sample_intervals.append({**interval, "start": start, "end": end, "duration": end - start})
+
+        return sample_intervals
+
+    def get_candidates(self):
+        return [
+            {"segment_count": segment_count, "threads": threads, "custom_flags": preset}
+            for segment_count in self.segment_counts
+            for threads in self.threads
+            for preset in self.presets
+        ]
+
+    def __render_candidate(self, sample_intervals, candidate, filter_options, temp_directory, output_filename):
+        planner = SegmentPlanner(sample_intervals, audible_speed=filter_options.get("audible_speed", 1.0),
+                                 silent_speed=filter_options.get("silent_speed", 6.0))
+        segments = planner.plan(candidate["segment_count"])
+
+        generator = FilterGenerator(segments, segmented=True)
+        generator.generate(**filter_options)
+
+        _, extension = os.path.splitext(self.input_filename)
+        segment_filename = os.path.join(temp_directory, f"segment_{{segment}}{extension or '.mkv'}")
+
+        editor = MediaEditor()
+        editor.set_editor_options(generator.get_filter(), self.input_filename, segment_filename,
+                                  custom_flags=candidate["custom_flags"])
+
+        start_time = time.time()
+        editor.edit(workers=len(segments), threads=candidate["threads"])
+        editor.combine(segment_filename, output_filename)
+        elapsed_time = time.time() - start_time
+
+        for i in range(len(segments)):
+            os.remove(segment_filename.format(segment=i))
+
+        if not os.path.exists(output_filename):
+            raise Exception(f"FFmpeg could not render the calibration sample with {candidate}.")
+
+        return elapsed_time
+
+    @staticmethod
+    def __measure_psnr(output_filename, reference_filename):
+        console_output = subprocess.run(
+            ["ffmpeg", "-i", output_filename, "-i", reference_filename,
+             "-lavfi", "[0:v][1:v]psnr", "-f", "null", "-"],
+            capture_output=True,
+            text=True
+        ).stderr
+
+        capture = re.search(r"PSNR .* average:([0-9.]+|inf)", console_output)
+        if capture is None:
+            return None
+
+        return float(capture[1])
+
+    def is_accepted(self, result):
+        if result["quality_check"] != "psnr":
+            return True
+
+        # A PSNR that could not be measured fails the check, it is no proof of matching quality
+        return result["psnr"] is not None and result["psnr"] >= self.min_psnr
+
+    def select_profile(self, results):
+        accepted_results = [result for result in results if self.is_accepted(result)]
+
+        return max(accepted_results, key=lambda result: result["throughput"])
+
+    def tune(self, use_cache=True, **filter_options):
+        cache_key = self.get_cache_key(filter_options)
+        cache = self.__load_cache()
+
+        if use_cache and cache_key in cache:
+            self.results = cache[cache_key]["results"]
+            return self.select_profile(self.results)
+
+        sample_intervals = self.get_sample_intervals()
+        if not sample_intervals:
+            raise Exception(f"There are no intervals to calibrate {self.input_filename} with.")
+
+        sample_duration = sample_intervals[-1]["end"] - sample_intervals[0]["start"]
+        _, extension = os.path.splitext(self.input_filename)
+
+        temp_directory = tempfile.mkdtemp(prefix="silence_remover_")
+        self.results = []
+
+        try:
+            reference_filename = None
+
+            for i, candidate in enumerate(self.get_candidates()):
+                output_filename = os.path.join(temp_directory, f"candidate_{i}{extension or '.mkv'}")
+                elapsed_time = self.__render_candidate(sample_intervals, candidate, filter_options,
+                                                       temp_directory, output_filename)
+
+                # The first candidate renders with the default encoder settings and serves as the quality reference
+                psnr = None
+                if reference_filename is None:
+                    reference_filename = output_filename
+                    quality_check = "reference"
+                elif filter_options.get("audio_only", False):
+                    quality_check = "audio_only"
+                else:
+                    psnr = self.__measure_psnr(output_filename, reference_filename)
+                    quality_check = "psnr"
+                    os.remove(output_filename)
+
+                self.results.append({
+                    **candidate,
+                    "elapsed_time": elapsed_time,
+                    "throughput": sample_duration / elapsed_time if elapsed_time > 0 else float("inf"),
+                    "psnr": psnr,
+                    "quality_check": quality_check
+                })
+        finally:
+            shutil.rmtree(temp_directory, ignore_errors=True)
+
+        profile = self.select_profile(self.results)
+
+        cache[cache_key] = {
+            "results": self.results,
+            "created": time.time()
+        }
+        self.__store_cache(cache)
+
+        return profile
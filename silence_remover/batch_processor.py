@@ -0,0 +1,262 @@
+import hashlib
+import json
+import os
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from silence_remover.silence_detector import SilenceDetector
+from silence_remover.filter_generator import FilterGenerator
+from silence_remover.media_editor import MediaEditor
+from silence_remover.media_editor.pipe_io import open_pipe_files, start_pipe_files, close_pipe_files
+
+
+class BatchProcessor:
+    MEDIA_EXTENSIONS = (".mp4", ".mkv", ".mov", ".avi", ".webm", ".flv", ".m4v",
+                        ".mp3", ".wav", ".m4a", ".aac", ".flac", ".ogg", ".opus")
+
+    def __init__(self, inputs, output_directory, workers=None, segment_count=None, output_suffix="_trimmed",
+                 manifest_filename=None, detection_engine="ffmpeg", threads=None):
+        self.output_directory = output_directory
+        self.segment_directory = os.path.join(output_directory, ".segments")
+        self.output_names = self.__collect_files(inputs)
+        self.files = list(self.output_names)
+        self.workers = workers or os.cpu_count() or 1
+        self.segment_count = segment_count or self.workers
+        self.threads = threads or max(1, (os.cpu_count() or 1) // self.workers)
+        self.output_suffix = output_suffix
+        self.manifest_filename = manifest_filename or os.path.join(output_directory, "silence_remover_batch.json")
+        self.detection_engine = detection_engine
+
+        self.manifest = {"files": {}}
+        self.jobs = {}
+        self.processes = {}
+        self.lock = threading.Lock()
+
+    def __collect_files(self, inputs):
+        excluded_directories = {os.path.abspath(self.output_directory), os.path.abspath(self.segment_directory)}
+        files = []
+
+        for path in inputs:
+            if os.path.isdir(path):
+                for directory, directories, filenames in os.walk(path):
+                    # Earlier outputs must not be picked up as inputs when the output directory is inside an input
+                    directories[:] = sorted(
+                        name for name in directories
+                        if os.path.abspath(os.path.join(directory, name)) not in excluded_directories
+                    )
+                    files.extend(
+                        (os.path.join(directory, filename), os.path.relpath(os.path.join(directory, filename), path))
+                        for filename in sorted(filenames)
+                        if filename.lower().endswith(self.MEDIA_EXTENSIONS)
+                    )
+            else:
+                files.append((path, os.path.basename(path)))
+
+        unique_files = {}
+        for filename, name in files:
+            unique_files.setdefault(os.path.abspath(filename), name)
+
+        # Output names mirror the path below the input directory and get a path hash when they would still collide
+        name_counts = {}
+        for name in unique_files.values():
+            name_counts[name] = name_counts.get(name, 0) + 1
+
+        output_names = {}
+        for filename, name in unique_files.items():
+            if name_counts[name] > 1:
+                stem, extension = os.path.splitext(name)
+                name = f"{stem}_{hashlib.sha256(filename.encode()).hexdigest()[:8]}{extension}"
+
+            output_names[filename] = name
+
+        return output_names
+
+    def __load_manifest(self):
+        try:
+            with open(self.manifest_filename, "r") as f:
+                self.manifest = json.loads(f.read())
+        except (OSError, ValueError):
+            self.manifest = {"files": {}}
+
+    def __store_manifest(self):
+        with open(self.manifest_filename + ".tmp", "w+") as f:
+            f.write(json.dumps(self.manifest, indent=4))
+
+        os.replace(self.manifest_filename + ".tmp", self.manifest_filename)
+
+    def __update_file(self, filename, **values):
+        self.manifest["files"][filename].update(values)
+        self.__store_manifest()
+
+    def __get_output_filenames(self, filename):
+        stem, extension = os.path.splitext(self.output_names[filename])
+
+        return (
+            os.path.join(self.segment_directory, f"{stem}_{{segment}}{extension}"),
+            os.path.join(self.output_directory, f"{stem}{self.output_suffix}{extension}")
+        )
+
+    def __run_command(self, filename, command, temp_files):
+        process = None
+        try:
+            command, pass_fds = open_pipe_files(command, temp_files)
+            with self.lock:
+                if self.manifest["files"][filename]["status"] == "failed":
+                    raise Exception(f"Rendering {filename} was cancelled.")
+
+                process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+                                           pass_fds=pass_fds)
+                self.processes.setdefault(filename, set()).add(process)
+            start_pipe_files(temp_files)
+
+            console_output = process.communicate()[1]
+        finally:
+            close_pipe_files(temp_files)
+            if process is not None:
+                with self.lock:
+                    self.processes[filename].discard(process)
+
+        if process.returncode != 0:
+            raise Exception(f"FFmpeg exited with code {process.returncode}:\n{console_output[-2000:]}")
+
+        return console_output
+
+    @staticmethod
+    def __detect(detector, detection_options):
+        detector.detect(**detection_options)
+
+        return detector.parse(**detection_options)
+
+    def __submit(self, executor, futures, filename, stage, function, *args):
+        future = executor.submit(function, *args)
+        futures[future] = (filename, stage)
+
+    def __fail(self, futures, filename, error):
+        # Queued jobs of the file are cancelled and running ones are killed, they would only leave stray segments
+        for future, (other_filename, _) in list(futures.items()):
+            if other_filename == filename and future.cancel():
+                del futures[future]
+
+        with self.lock:
+            self.manifest["files"][filename].update(status="failed", error=error)
+            for process in self.processes.get(filename, ()):
+                process.kill()
+        self.__store_manifest()
+
+        self.__remove_failed_segments(futures, filename)
+
+    def __remove_failed_segments(self, futures, filename):
+        # The segments are only removed once no job of the file can write them anymore
+        if any(other_filename == filename for other_filename, _ in futures.values()):
+            return
+
+        job = self.jobs.pop(filename, None)
+        if job is None:
+            return
+
+        segment_filename, _ = self.__get_output_filenames(filename)
+        for i in range(job["editor"].get_segment_count()):
+            try:
+                os.remove(segment_filename.format(segment=i))
+            except FileNotFoundError:
+                pass
+
+    def __on_detected(self, executor, futures, filename, intervals, filter_options):
+        segment_filename, output_filename = self.__get_output_filenames(filename)
+        os.makedirs(os.path.dirname(segment_filename), exist_ok=True)
+        os.makedirs(os.path.dirname(output_filename), exist_ok=True)
+
+        generator = FilterGenerator(intervals, segmented=True)
+        generator.generate(**filter_options)
+
+        editor = MediaEditor()
+        editor.set_editor_options(generator.get_filter(), filename, segment_filename,
+                                  custom_flags=filter_options.get("custom_flags", ""))
+
+        jobs = editor.prepare_jobs(threads=self.threads)
+        self.jobs[filename] = {"editor": editor, "remaining": len(jobs), "started": time.time()}
+
+        for _, command, temp_files in jobs:
+            self.__submit(executor, futures, filename, "render", self.__run_command, filename, command, temp_files)
+
+    def __on_rendered(self, executor, futures, filename):
+        job = self.jobs[filename]
+        job["remaining"] -= 1
+
+        if job["remaining"] == 0:
+            segment_filename, output_filename = self.__get_output_filenames(filename)
+            self.__update_file(filename, status="combining",
+                               timings={**self.manifest["files"][filename]["timings"],
+                                        "render": time.time() - job["started"]})
+
+            job["started"] = time.time()
+            command, temp_files = job["editor"].prepare_combine(segment_filename, output_filename)
+            self.__submit(executor, futures, filename, "combine", self.__run_command, filename, command, temp_files)
+
+    def __on_combined(self, filename):
+        job = self.jobs.pop(filename)
+        segment_filename, output_filename = self.__get_output_filenames(filename)
+
+        for i in range(job["editor"].get_segment_count()):
+            os.remove(segment_filename.format(segment=i))
+
+        self.__update_file(filename, status="done", output=output_filename,
+                           timings={**self.manifest["files"][filename]["timings"],
+                                    "combine": time.time() - job["started"]})
+
+    def run(self, detection_options=None, filter_options=None):
+        detection_options = {"segment_count": self.segment_count, **(detection_options or {})}
+        filter_options = filter_options or {}
+
+        os.makedirs(self.output_directory, exist_ok=True)
+        self.__load_manifest()
+
+        for filename in self.files:
+            if self.manifest["files"].get(filename, {}).get("status") != "done":
+                self.manifest["files"][filename] = {"status": "pending", "timings": {}}
+        self.__store_manifest()
+
+        futures = {}
+        detection_started = {}
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for filename in self.files:
+                if self.manifest["files"][filename]["status"] == "done":
+                    continue
+
+                detector = SilenceDetector(filename, engine=self.detection_engine)
+                detection_started[filename] = time.time()
+                self.__update_file(filename, status="detecting")
+                self.__submit(executor, futures, filename, "detection", self.__detect, detector, detection_options)
+
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    filename, stage = futures.pop(future)
+
+                    if self.manifest["files"][filename]["status"] == "failed":
+                        self.__remove_failed_segments(futures, filename)
+                        continue
+
+                    if future.exception() is not None:
+                        self.__fail(futures, filename, str(future.exception()))
+                        continue
+
+                    if stage == "detection":
+                        self.__update_file(filename, status="rendering",
+                                           timings={"detection": time.time() - detection_started[filename]})
+                        self.__on_detected(executor, futures, filename, future.result(), filter_options)
+                    elif stage == "render":
+                        self.__on_rendered(executor, futures, filename)
+                    else:
+                        self.__on_combined(filename)
+
+        if os.path.isdir(self.segment_directory):
+            for directory, _, _ in os.walk(self.segment_directory, topdown=False):
+                if not os.listdir(directory):
+                    os.rmdir(directory)
+
+        return self.manifest
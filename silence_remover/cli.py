@@ -0,0 +1,80 @@
+import argparse
+import json
+import sys
+
+from silence_remover.batch_processor import BatchProcessor
+
+
+def parse_arguments(arguments=None):
+    parser = argparse.ArgumentParser(
+        prog="silence-remover",
+        description="Remove or speed up the silent parts of media files"
+    )
+
+    parser.add_argument("inputs", nargs="+", help="media files or directories containing media files")
+    parser.add_argument("-d", "--output-directory", default=".", help="directory for the processed files")
+    parser.add_argument("--suffix", default="_trimmed", help="suffix appended to every output filename")
+    parser.add_argument("--manifest", default=None, help="job manifest used to resume interrupted batches")
+
+    parser.add_argument("-w", "--workers", type=int, default=None, help="size of the shared worker pool")
+    parser.add_argument("--segments", type=int, default=None, help="number of segments rendered per file")
+    parser.add_argument("--threads", type=int, default=None, help="threads per FFmpeg process")
+    parser.add_argument("--engine", choices=("ffmpeg", "numpy"), default="ffmpeg", help="silence detection engine")
+
+    parser.add_argument("--silence-level-db", type=float, default=-35)
+    parser.add_argument("--silence-time-threshold", type=float, default=0.5)
+    parser.add_argument("--short-interval-threshold", type=float, default=0.3)
+    parser.add_argument("--stretch-time", type=float, default=0.25)
+
+    parser.add_argument("--audible-speed", type=float, default=1.0)
+    parser.add_argument("--audible-volume", type=float, default=1.0)
+    parser.add_argument("--silent-speed", type=float, default=6.0)
+    parser.add_argument("--silent-volume", type=float, default=0.5)
+    parser.add_argument("--audio-only", action="store_true")
+    parser.add_argument("--graph-strategy", choices=("per_interval", "grouped"), default="per_interval")
+
+    return parser.parse_args(arguments)
+
+
+def main(arguments=None):
+    arguments = parse_arguments(arguments)
+
+    processor = BatchProcessor(
+        arguments.inputs,
+        arguments.output_directory,
+        workers=arguments.workers,
+        segment_count=arguments.segments,
+        output_suffix=arguments.suffix,
+        manifest_filename=arguments.manifest,
+        detection_engine=arguments.engine,
+        threads=arguments.threads
+    )
+
+    manifest = processor.run(
+        detection_options={
+            "silence_level_db": arguments.silence_level_db,
+            "silence_time_threshold": arguments.silence_time_threshold,
+            "short_interval_threshold": arguments.short_interval_threshold,
+            "stretch_time": arguments.stretch_time,
+            "audible_speed": arguments.audible_speed,
+            "silent_speed": arguments.silent_speed
+        },
+        filter_options={
+            "audible_speed": arguments.audible_speed,
+            "audible_volume": arguments.audible_volume,
+            "silent_speed": arguments.silent_speed,
+            "silent_volume": arguments.silent_volume,
+            "audio_only": arguments.audio_only,
+            "graph_strategy": arguments.graph_strategy
+        }
+    )
+
+    failed_files = {filename: state for filename, state in manifest["files"].items() if state["status"] != "done"}
+    for filename, state in manifest["files"].items():
+        print(f"{state['status']:>8}  {filename}  {json.dumps(state['timings'])}")
+
+    return 1 if failed_files else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,20 @@
+import hashlib
+import os
+
+
+def get_file_identity(filename, sample_size=1024 * 1024):
+    stat = os.stat(filename)
+    digest = hashlib.sha256()
+
+    with open(filename, "rb") as f:
+        digest.update(f.read(sample_size))
+
+        if stat.st_size > sample_size:
+            f.seek(max(stat.st_size - sample_size, sample_size))
+            digest.update(f.read(sample_size))
+
+    return {
+        "size": stat.st_size,
+        "mtime": stat.st_mtime_ns,
+        "partial_hash": digest.hexdigest()
+    }
@@ -6,11 +6,14 @@ class FilterGenerator:
         self.segmented = segmented
 
         self.final_filter_lines = []
+        self.segment_ranges = []
         self.filter_lines = []
         self.media_components = []
+        self.grouped_components = []
         self.current_component_index = 0
 
     def generate(self, **kwargs):
+        self.render_options = kwargs
         self.options = {
             "audible": {
                 "speed": kwargs.get("audible_speed", 1.0),
@@ -24,18 +27,33 @@ class FilterGenerator:
                 "video_pad": kwargs.get("video_output_pad", "vout"),
                 "audio_pad": kwargs.get("audio_output_pad", "aout")
             },
-            "audio_only": kwargs.get("audio_only", False)
+            "audio_only": kwargs.get("audio_only", False),
+            "graph_strategy": kwargs.get("graph_strategy", "per_interval"),
+            "audio_frame_size": kwargs.get("audio_frame_size", 256),
+            "audio_sample_rate": kwargs.get("audio_sample_rate", 48000)
         }
 
+        if self.options["graph_strategy"] not in ("per_interval", "grouped"):
+            raise Exception(f"Unknown graph strategy '{self.options['graph_strategy']}'. "
+                            f"Please choose 'per_interval' or 'grouped'.")
+
         if self.segmented:
             for segmented_intervals in self.intervals:
+                # Segments are rendered from a seek to their first interval, so their trims are rebased to it
+                segment_start = segmented_intervals[0]["start"] if segmented_intervals else 0
+                segment_end = segmented_intervals[-1]["end"] if segmented_intervals else 0
+
                 for interval in segmented_intervals:
-                    self.__add_media_component(interval["start"], interval["end"], interval["silent"])
+                    self.__add_media_component(interval["start"] - segment_start, interval["end"] - segment_start,
+                                               interval["silent"])
+
+                self.segment_ranges.append([segment_start, segment_end])
 
                 self.__concat_media_components()
                 self.final_filter_lines.append(self.filter_lines)
                 self.filter_lines = []
                 self.media_components = []
+                self.grouped_components = []
                 self.current_component_index = 0
         else:
             for interval in self.intervals:
@@ -51,6 +69,10 @@ class FilterGenerator:
             rounded_start_time = round(start_time, 4)
             rounded_end_time = round(end_time, 4)
 
+            if self.options["graph_strategy"] == "grouped":
+                self.__add_grouped_component(rounded_start_time, rounded_end_time, speed, silent)
+                return
+
             if not self.options["audio_only"]:
                 self.__add_video_component(rounded_start_time, rounded_end_time, speed)
 
@@ -108,7 +130,110 @@ class FilterGenerator:
                 f"[af{self.current_component_index}]"
             )
 
+    def __add_grouped_component(self, start_time, end_time, speed, silent):
+        volume = self.options["silent"]["volume"] if silent else self.options["audible"]["volume"]
+
+        if self.grouped_components:
+            previous = self.grouped_components[-1]
+            if previous["end"] == start_time and previous["speed"] == speed and previous["volume"] == volume:
+                previous["end"] = end_time
+                return
+
+        self.grouped_components.append({
+            "start": start_time,
+            "end": end_time,
+            "speed": speed,
+            "volume": volume,
+            "silent": silent
+        })
+
+    def __snap_grouped_components(self):
+        # aselect keeps whole audio frames, so every group is snapped to the frame grid and the video timestamps
+        # and tempo switches are computed from the same snapped boundaries
+        frame_time = self.options["audio_frame_size"] / self.options["audio_sample_rate"]
+
+        components = []
+        for c in self.grouped_components:
+            first_frame, last_frame = int(round(c["start"] / frame_time)), int(round(c["end"] / frame_time))
+            if last_frame > first_frame:
+                components.append({
+                    **c,
+                    "first_frame": first_frame,
+                    "last_frame": last_frame,
+                    "start": round(first_frame * frame_time, 6),
+                    "end": round(last_frame * frame_time, 6)
+                })
+
+        return components, frame_time
+
+    def __concat_grouped_components(self):
+        components, frame_time = self.__snap_grouped_components()
+
+        if not self.options["audio_only"]:
+            selection = "+".join(f"gte(t,{c['start']})*lt(t,{c['end']})" for c in components) or "0"
+
+            # Every group is mapped onto the output timeline by a single piecewise-linear setpts expression
+            output_time = 0.0
+            timestamp_terms = []
+            for c in components:
+                timestamp_terms.append(
+                    f"gte(T,{c['start']})*lt(T,{c['end']})*({round(output_time, 6)}+(T-{c['start']})*{round(1 / c['speed'], 4)})"
+                )
+                output_time += (c["last_frame"] - c["first_frame"]) * frame_time / c["speed"]
+
+            self.filter_lines.append(
+                f"[0:v]select='{selection}',setpts='({'+'.join(timestamp_terms) or '0'})/TB'"
+                f"[{self.options['output']['video_pad']}]"
+            )
+
+        # Audio frames are selected by their index, which is exact where their timestamps are not
+        audio_selection = "+".join(f"gte(n,{c['first_frame']})*lt(n,{c['last_frame']})" for c in components) or "0"
+
+        volumes = set(c["volume"] for c in components)
+        if len(volumes) > 1:
+            half_frame_time = frame_time / 2
+            volume_expression = "+".join(
+                f"gte(t,{round(c['start'] - half_frame_time, 6)})*"
+                f"lt(t,{round(c['end'] - half_frame_time, 6)})*{c['volume']}"
+                for c in components
+            )
+            volume_filter = f"volume='{volume_expression}':eval=frame"
+        else:
+            volume_filter = f"volume={volumes.pop()}" if volumes and volumes != {1.0} else ""
+
+        # A single atempo is switched to the speed of every group by commands on the selected timeline, each command
+        # is placed half a frame early so the first frame of its group always triggers it
+        tempo_commands = []
+        selected_frames = 0
+        for previous, c in zip([None] + components, components):
+            if previous is not None and previous["speed"] != c["speed"]:
+                command_time = (selected_frames - 0.5) * frame_time
+                tempo_commands.append(f"{round(command_time, 6)} atempo tempo {round(c['speed'], 4)}")
+            selected_frames += c["last_frame"] - c["first_frame"]
+
+        speeds = set(c["speed"] for c in components)
+        tempo_filter = f"atempo={round(components[0]['speed'], 4)}" if components and speeds != {1.0} else ""
+
+        audio_filter_list = [
+            f"aresample={self.options['audio_sample_rate']}",
+            # aselect keeps or drops whole frames, small fixed-size frames bound the error at every cut
+            f"asetnsamples=n={self.options['audio_frame_size']}:p=0",
+            f"aselect='{audio_selection}'",
+            volume_filter,
+            "asetpts=N/SR/TB",
+            f"asendcmd=c='{';'.join(tempo_commands)}'" if tempo_commands else "",
+            tempo_filter
+        ]
+
+        self.filter_lines.append(
+            f"[0:a]{','.join(x for x in audio_filter_list if x)}[{self.options['output']['audio_pad']}]"
+        )
+
     def __concat_media_components(self):
+        if self.options["graph_strategy"] == "grouped":
+            self.__concat_grouped_components()
+            return
+
         media_components_string = "".join(self.media_components)
 
         if self.options["audio_only"]:
@@ -131,16 +256,37 @@ class FilterGenerator:
             "filter_lines":self.final_filter_lines,
             "audio_only":self.options["audio_only"],
             "output":self.options["output"],
-            "segmented":self.segmented
+            "segmented":self.segmented,
+            "segment_ranges":self.segment_ranges
         }
 
-    def generate_editor_file(self, output_config_file, input_media_file, output_media_file, custom_flags=""):
-        output = {
-            "filter": self.get_filter(),
+    def get_config(self):
+        segments = self.intervals if self.segmented else [self.intervals]
+        intervals = [interval for segment in segments for interval in segment]
+
+        editor_filter = self.get_filter()
+        del editor_filter["filter_lines"]
+
+        return {
+            "version": 2,
+            "filter": editor_filter,
+            "intervals": {
+                "start": [interval["start"] for interval in intervals],
+                "end": [interval["end"] for interval in intervals],
+                "silent": [int(interval["silent"]) for interval in intervals]
+            },
+            "segment_lengths": [len(segment) for segment in segments],
+            "render_options": self.render_options
+        }
+
+    def generate_editor_file(self, output_config_file, input_media_file, output_media_file, custom_flags="",
+                             compact=True):
+        output = self.get_config() if compact else {"filter": self.get_filter()}
+        output.update({
             "input_media_file": input_media_file,
             "output_media_file": output_media_file,
             "custom_flags": custom_flags
-        }
+        })
 
         with open(output_config_file, "w+") as f:
-            f.write(json.dumps(output))
\ No newline at end of file
+            f.write(json.dumps(output))
@@ -0,0 +1,38 @@
+import time
+from contextlib import contextmanager
+
+
+class Instrumentation:
+    def __init__(self):
+        self.hooks = []
+        self.spans = []
+
+    def add_hook(self, hook):
+        self.hooks.append(hook)
+
+    def emit(self, event):
+        for hook in self.hooks:
+            hook(event)
+
+    @contextmanager
+    def span(self, name, **info):
+        start_time = time.perf_counter()
+        self.emit({"type": "span_start", "name": name, **info})
+
+        failed = True
+        try:
+            yield
+            failed = False
+        finally:
+            span = {
+                "type": "span_end",
+                "name": name,
+                "duration": time.perf_counter() - start_time,
+                "failed": failed,
+                **info
+            }
+            self.spans.append(span)
+            self.emit(span)
+
+    def progress(self, name, progress, **info):
+        self.emit({"type": "progress", "name": name, **info, **progress})
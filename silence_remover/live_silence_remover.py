@@ -0,0 +1,226 @@
+import os
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from silence_remover.silence_detector import IntervalParser, DecodeProfile
+from silence_remover.filter_generator import FilterGenerator
+from silence_remover.media_editor import MediaEditor, ProgressParser
+from silence_remover.media_editor.pipe_io import InlineFile, open_pipe_files, start_pipe_files, close_pipe_files
+
+
+class LiveSilenceRemover:
+    def __init__(self, input_filename, output_filename, commit_horizon=10.0, min_segment_time=30.0,
+                 max_segment_time=120.0, poll_interval=2.0, idle_timeout=10.0, audio_track=0, tolerance=1e-3):
+        self.input_filename = input_filename
+        self.output_filename = output_filename
+        self.commit_horizon = commit_horizon
+        self.min_segment_time = min_segment_time
+        self.max_segment_time = max_segment_time
+        self.poll_interval = poll_interval
+        self.idle_timeout = idle_timeout
+        self.decode_profile = DecodeProfile(audio_track=audio_track)
+        self.tolerance = tolerance
+
+        stem, extension = os.path.splitext(output_filename)
+        self.segment_filename = f"{stem}_live{{segment}}{extension}"
+
+        self.finalized_time = 0.0
+        self.scanned_time = 0.0
+        self.pending_intervals = []
+        self.segment_count = 0
+        self.render_futures = []
+
+    def __scan(self, silence_level_db, silence_time_threshold, final=False):
+        audio_filters = self.decode_profile.get_filters() + [
+            f"silencedetect=noise={silence_level_db}dB:d={silence_time_threshold}"
+        ]
+
+        process = subprocess.run(
+            ["ffmpeg", "-progress", "pipe:1", "-nostats",
+             "-ss", str(self.finalized_time), "-i", self.input_filename,
+             *self.decode_profile.get_stream_flags(),
+             "-af", ",".join(audio_filters),
+             "-f", "null", "-"],
+            capture_output=True,
+            text=True
+        )
+
+        # A recording that is still being written can fail to read for a moment, so the scan is retried on the
+        # next poll, a failed final scan would silently truncate the output
+        if process.returncode != 0:
+            if final:
+                raise Exception(f"FFmpeg exited with code {process.returncode} while scanning {self.input_filename}.")
+            return None
+
+        progress_parser = ProgressParser()
+        scanned_duration = 0.0
+        for line in process.stdout.split("\n"):
+            progress = progress_parser.feed_line(line)
+            if progress is not None and progress["out_time"] is not None:
+                scanned_duration = max(scanned_duration, progress["out_time"])
+
+        interval_parser = IntervalParser()
+        for line in process.stderr.split("\n"):
+            interval_parser.feed_line(line)
+
+        # Once the recording has stopped, silence running into the end of the file is final as well
+        if final:
+            interval_parser.close_open_interval(scanned_duration)
+
+        # Silence that is still running at the end of the scan is not closed yet and is picked up by the next scan
+        self.pending_intervals = [
+            {
+                "start": self.finalized_time + interval["start"],
+                "silent": True,
+                "end": self.finalized_time + interval["end"],
+                "duration": interval["duration"]
+            }
+            for interval in interval_parser.get_intervals()
+            if final or interval["end"] < scanned_duration - self.tolerance
+        ]
+        self.scanned_time = self.finalized_time + scanned_duration
+
+        return self.scanned_time
+
+    def find_commit_time(self, final):
+        if final:
+            return self.scanned_time
+
+        # Committing at the end of a closed silence guarantees that no silent run straddles the commit point
+        commit_time = self.finalized_time
+        for interval in self.pending_intervals:
+            if interval["end"] <= self.scanned_time - self.commit_horizon:
+                commit_time = interval["end"]
+
+        if commit_time - self.finalized_time >= self.min_segment_time:
+            return commit_time
+
+        # Without a long enough silence the span is cut behind the horizon anyway, so rendering keeps up with the
+        # recording and every scan decodes a bounded amount
+        fallback_time = self.scanned_time - self.commit_horizon
+        if fallback_time - self.finalized_time >= self.max_segment_time:
+            for interval in self.pending_intervals:
+                if interval["start"] < fallback_time < interval["end"]:
+                    return interval["end"]
+
+            return fallback_time
+
+        return self.finalized_time
+
+    def get_span_intervals(self, commit_time, parse_options, final=False):
+        # A silence closed at the end of the file can report an end slightly past the decoded duration
+        silent_intervals = [
+            {
+                "start": interval["start"] - self.finalized_time,
+                "silent": True,
+                "end": min(interval["end"], commit_time) - self.finalized_time,
+                "duration": min(interval["end"], commit_time) - interval["start"]
+            }
+            for interval in self.pending_intervals if interval["start"] < commit_time
+        ]
+
+        stretch_time = parse_options.get("stretch_time", 0.25)
+        intervals = (
+            IntervalParser()
+            .load_intervals(silent_intervals, commit_time - self.finalized_time)
+            .insert_additional_intervals()
+            .mark_short_intervals(short_interval_threshold=parse_options.get("short_interval_threshold", 0.3))
+            .combine_and_remove_intervals()
+            .stretch_audible_intervals(stretch_time=stretch_time)
+            .get_intervals()
+        )
+
+        # The padding in front of the audio after the commit point is cut from this silence, the next span starts
+        # that much earlier and picks it up as audible
+        last_interval = intervals[-1]
+        if not final and last_interval["silent"] and last_interval["duration"] > stretch_time / 2:
+            last_interval["end"] -= stretch_time / 2
+            last_interval["duration"] -= stretch_time / 2
+            commit_time -= stretch_time / 2
+
+        for interval in intervals:
+            interval["start"] += self.finalized_time
+            interval["end"] += self.finalized_time
+
+        return intervals, commit_time
+
+    def __render_segment(self, intervals, segment, custom_flags, filter_options):
+        generator = FilterGenerator([intervals], segmented=True)
+        generator.generate(**filter_options)
+
+        editor = MediaEditor()
+        editor.set_editor_options(generator.get_filter(), self.input_filename,
+                                  self.segment_filename.replace("{segment}", str(segment)),
+                                  custom_flags=custom_flags)
+
+        return editor.edit(segment=0)
+
+    def __commit(self, commit_time, executor, parse_options, custom_flags, filter_options, final):
+        intervals, commit_time = self.get_span_intervals(commit_time, parse_options, final=final)
+
+        self.render_futures.append(
+            executor.submit(self.__render_segment, intervals, self.segment_count, custom_flags, filter_options)
+        )
+        self.segment_count += 1
+        self.finalized_time = commit_time
+
+    def __combine(self, re_encode):
+        file_list = InlineFile("\n".join(
+            f"file {os.path.abspath(self.segment_filename.replace('{segment}', str(i)))}"
+            for i in range(self.segment_count)
+        ))
+
+        command = ["ffmpeg", "-f", "concat", "-safe", "0", "-i", file_list]
+        if not re_encode:
+            command.extend(["-c", "copy"])
+        command.extend(["-y", self.output_filename])
+
+        try:
+            command, pass_fds = open_pipe_files(command, [file_list])
+            process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+                                       pass_fds=pass_fds)
+            start_pipe_files([file_list])
+
+            console_output = process.communicate()[1]
+        finally:
+            close_pipe_files([file_list])
+
+        return console_output.split("\n")
+
+    def run(self, silence_level_db=-35, silence_time_threshold=0.5, short_interval_threshold=0.3,
+            stretch_time=0.25, custom_flags="", re_encode=False, **filter_options):
+        parse_options = {
+            "short_interval_threshold": short_interval_threshold,
+            "stretch_time": stretch_time
+        }
+
+        previous_size = -1
+        last_growth_time = time.time()
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            while True:
+                size = os.path.getsize(self.input_filename) if os.path.exists(self.input_filename) else -1
+                if size != previous_size:
+                    previous_size = size
+                    last_growth_time = time.time()
+
+                final = time.time() - last_growth_time >= self.idle_timeout
+
+                if size > 0 and self.__scan(silence_level_db, silence_time_threshold, final=final) is not None:
+                    commit_time = self.find_commit_time(final)
+                    if commit_time - self.finalized_time > self.tolerance:
+                        self.__commit(commit_time, executor, parse_options, custom_flags, filter_options, final)
+
+                if final:
+                    break
+
+                time.sleep(self.poll_interval)
+
+            for future in self.render_futures:
+                future.result()
+
+        if self.segment_count == 0:
+            raise Exception(f"No media could be read from {self.input_filename}.")
+
+        return self.__combine(re_encode)
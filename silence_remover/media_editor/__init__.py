@@ -1 +1,4 @@
-from silence_remover.media_editor.media_editor import MediaEditor
\ No newline at end of file
+from silence_remover.media_editor.media_editor import MediaEditor
+from silence_remover.media_editor.render_scheduler import RenderScheduler
+from silence_remover.media_editor.smart_cutter import SmartCutter
+from silence_remover.media_editor.progress_parser import ProgressParser
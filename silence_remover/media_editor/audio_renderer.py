@@ -0,0 +1,241 @@
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+
+import numpy as np
+
+
+class AudioRenderer:
+    def __init__(self, input_filename, output_filename, intervals, sample_rate=None, channels=None, audio_track=0,
+                 fade_time=0.005, window_time=0.02, custom_flags=""):
+        self.input_filename = input_filename
+        self.output_filename = output_filename
+        self.intervals = intervals
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.audio_track = audio_track
+        self.fade_time = fade_time
+        self.window_time = window_time
+        self.custom_flags = custom_flags
+
+        self.samples = None
+        self.temp_directory = None
+
+    def get_fade_length(self):
+        return max(1, int(round(self.fade_time * self.sample_rate)))
+
+    def get_window_length(self):
+        return max(4, int(round(self.window_time * self.sample_rate)) // 2 * 2)
+
+    def probe_audio_stream(self):
+        process = subprocess.run(
+            ["ffprobe", "-v", "error", "-select_streams", f"a:{self.audio_track}",
+             "-show_entries", "stream=sample_rate,channels", "-of", "json", self.input_filename],
+            capture_output=True,
+            text=True
+        )
+
+        try:
+            stream = json.loads(process.stdout)["streams"][0]
+        except (ValueError, KeyError, IndexError):
+            raise Exception(f"FFprobe could not find audio track {self.audio_track} in {self.input_filename}.")
+
+        # The source layout and rate are kept unless overridden, so the output matches the filter graph path
+        self.sample_rate = self.sample_rate or int(stream["sample_rate"])
+        self.channels = self.channels or int(stream["channels"])
+
+        return self
+
+    def decode(self):
+        if self.sample_rate is None or self.channels is None:
+            self.probe_audio_stream()
+
+        self.temp_directory = tempfile.mkdtemp(prefix="silence_remover_")
+        buffer_filename = os.path.join(self.temp_directory, "samples.f32")
+
+        process = subprocess.Popen(
+            ["ffmpeg", "-i", self.input_filename,
+             "-map", f"0:a:{self.audio_track}", "-vn", "-sn", "-dn",
+             "-ac", str(self.channels), "-ar", str(self.sample_rate),
+             "-f", "f32le", "pipe:"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+
+        with open(buffer_filename, "wb") as f:
+            shutil.copyfileobj(process.stdout, f, 1024 * 1024)
+
+        process.stdout.close()
+        if process.wait() != 0:
+            raise Exception(f"FFmpeg could not decode the audio of {self.input_filename}.")
+
+        frame_count = os.path.getsize(buffer_filename) // (4 * self.channels)
+        if frame_count == 0:
+            self.samples = np.zeros((0, self.channels), dtype="<f4")
+        else:
+            self.samples = np.memmap(buffer_filename, dtype="<f4", mode="r", shape=(frame_count, self.channels))
+
+        return self
+
+    def time_stretch(self, samples, speed):
+        window_length = self.get_window_length()
+        synthesis_hop = window_length // 2
+        analysis_hop = synthesis_hop * speed
+        tolerance = window_length // 4
+
+        output_length = int(len(samples) / speed)
+
+        # Pieces shorter than two windows cannot be overlapped, their samples are repeated or skipped instead
+        if len(samples) < 2 * window_length:
+            return samples[(np.arange(output_length) * speed).astype(np.int64)]
+        frame_count = output_length // synthesis_hop + 1
+
+        padding = window_length + tolerance
+        padded = np.concatenate((
+            np.zeros((tolerance, self.channels), dtype=np.float32),
+            samples,
+            np.zeros((padding + window_length, self.channels), dtype=np.float32)
+        ))
+        mono = padded.mean(axis=1)
+
+        window = np.hanning(window_length + 1)[:-1].astype(np.float32)[:, np.newaxis]
+        output = np.zeros((frame_count * synthesis_hop + window_length, self.channels), dtype=np.float32)
+        candidates = np.lib.stride_tricks.sliding_window_view(mono, window_length)
+
+        position = tolerance
+        for k in range(frame_count):
+            output[k * synthesis_hop:k * synthesis_hop + window_length] += padded[position:position + window_length] \
+                                                                          * window
+
+            # The next frame is chosen around its nominal position to best continue the frame just written
+            template = mono[position + synthesis_hop:position + synthesis_hop + window_length]
+            nominal = tolerance + int(round((k + 1) * analysis_hop))
+            search_start = max(0, nominal - tolerance)
+            search_end = min(len(candidates), nominal + tolerance + 1)
+            if search_start >= search_end:
+                break
+
+            correlation = candidates[search_start:search_end] @ template
+            position = search_start + int(np.argmax(correlation))
+
+        return output[:output_length]
+
+    def __render_interval(self, interval, options):
+        speed = options["silent_speed"] if interval["silent"] else options["audible_speed"]
+        volume = options["silent_volume"] if interval["silent"] else options["audible_volume"]
+
+        if speed <= 0:
+            return None
+
+        start = int(round(interval["start"] * self.sample_rate))
+        end = int(round(interval["end"] * self.sample_rate))
+        samples = self.samples[start:end]
+
+        if speed != 1.0:
+            samples = self.time_stretch(samples, speed)
+
+        return samples * np.float32(volume)
+
+    def __get_lead_in(self, interval, options, length):
+        volume = options["silent_volume"] if interval["silent"] else options["audible_volume"]
+        start = int(round(interval["start"] * self.sample_rate))
+
+        lead_in = self.samples[max(0, start - length):start] * np.float32(volume)
+        if len(lead_in) < length:
+            lead_in = np.concatenate((np.zeros((length - len(lead_in), self.channels), dtype=np.float32), lead_in))
+
+        return lead_in
+
+    def __crossfade(self, piece, lead_in):
+        # The source audio in front of the next piece is faded in over the end of this one, so the output keeps
+        # the same length as the filter graph while every cut is an overlapping crossfade
+        fade_length = min(len(lead_in), len(piece))
+        if fade_length == 0:
+            return piece
+
+        ramp = np.linspace(0.0, 1.0, fade_length + 1, dtype=np.float32)[1:, np.newaxis]
+        piece[-fade_length:] = piece[-fade_length:] * (1 - ramp) + lead_in[-fade_length:] * ramp
+
+        return piece
+
+    def generate_encode_command(self):
+        command = [
+            "ffmpeg",
+            "-f", "f32le", "-ar", str(self.sample_rate), "-ac", str(self.channels),
+            "-i", "pipe:0"
+        ]
+
+        if isinstance(self.custom_flags, list):
+            command.extend(self.custom_flags)
+        elif self.custom_flags:
+            command.append(self.custom_flags)
+
+        command.extend(["-y", self.output_filename])
+
+        return command
+
+    def generate_pieces(self, audible_speed=1.0, silent_speed=6.0, audible_volume=1.0, silent_volume=0.5, **kwargs):
+        options = {
+            "audible_speed": audible_speed,
+            "silent_speed": silent_speed,
+            "audible_volume": audible_volume,
+            "silent_volume": silent_volume
+        }
+
+        previous_piece = None
+        for interval in self.intervals:
+            if interval["end"] <= interval["start"]:
+                continue
+
+            piece = self.__render_interval(interval, options)
+            if piece is None or len(piece) == 0:
+                continue
+
+            if previous_piece is not None:
+                yield self.__crossfade(previous_piece, self.__get_lead_in(interval, options, self.get_fade_length()))
+
+            previous_piece = piece
+
+        if previous_piece is not None:
+            yield previous_piece
+
+    def render(self, **kwargs):
+        try:
+            if self.samples is None:
+                self.decode()
+
+            # The console output goes to a file so a full stderr pipe can never block the encoder
+            console_file = tempfile.TemporaryFile(dir=self.temp_directory)
+            process = subprocess.Popen(
+                self.generate_encode_command(),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=console_file
+            )
+
+            try:
+                for piece in self.generate_pieces(**kwargs):
+                    process.stdin.write(piece.astype("<f4", copy=False).tobytes())
+            finally:
+                process.stdin.close()
+
+            return_code = process.wait()
+            console_file.seek(0)
+            console_output = console_file.read().decode(errors="replace")
+            console_file.close()
+
+            if return_code != 0:
+                raise Exception(f"FFmpeg could not encode {self.output_filename}.")
+
+            return console_output.split("\n")
+        finally:
+            self.close()
+
+    def close(self):
+        self.samples = None
+
+        if self.temp_directory is not None:
+            shutil.rmtree(self.temp_directory, ignore_errors=True)
+            self.temp_directory = None
@@ -1,20 +1,32 @@
+import hashlib
 import json
-import tempfile
 import subprocess
 import os
 
+from silence_remover.file_identity import get_file_identity
+from silence_remover.filter_generator import FilterGenerator
+from silence_remover.media_editor.render_scheduler import RenderScheduler
+from silence_remover.media_editor.pipe_io import InlineFile, OutputStream, open_pipe_files, start_pipe_files, \
+    close_pipe_files
+
 
 class MediaEditor:
-    def __init__(self):
+    def __init__(self, instrumentation=None):
+        self.instrumentation = instrumentation
         self.options = {}
         self.configured = False
+        self.render_results = []
+        self.filter_lines_cache = {}
 
-    def set_editor_options(self, filter, input_media_file, output_media_file, custom_flags=""):
+    def set_editor_options(self, filter, input_media_file, output_media_file, custom_flags="",
+                           stream_format="matroska"):
+        self.filter_lines_cache = {}
         self.options = {
             "filter": filter,
             "input_media_file": input_media_file,
             "output_media_file": output_media_file,
-            "custom_flags": custom_flags
+            "custom_flags": custom_flags,
+            "stream_format": stream_format
         }
         self.configured = True
 
@@ -23,24 +35,85 @@ class MediaEditor:
             self.options = json.loads(f.read())
         self.configured = True
 
-    def __generate_temp_file(self, content, join_sequence=";\n"):
-        filename = tempfile.NamedTemporaryFile().name
-        with open(filename, "w+") as f:
-            f.write(join_sequence.join(content))
+        self.filter_lines_cache = {}
+
+    def get_segment_count(self):
+        if not self.options["filter"]["segmented"]:
+            return 1
+
+        if self.options.get("version", 1) >= 2:
+            return len(self.options["segment_lengths"])
+
+        return len(self.options["filter"]["filter_lines"])
+
+    def __get_config_intervals(self, segment):
+        intervals = self.options["intervals"]
+        first_index, last_index = 0, len(intervals["start"])
+
+        if segment is not None:
+            first_index = sum(self.options["segment_lengths"][:segment])
+            last_index = first_index + self.options["segment_lengths"][segment]
+
+        return [
+            {
+                "start": intervals["start"][i],
+                "end": intervals["end"][i],
+                "silent": bool(intervals["silent"][i]),
+                "duration": intervals["end"][i] - intervals["start"][i]
+            }
+            for i in range(first_index, last_index)
+        ]
+
+    def get_filter_lines(self, segment=None):
+        if self.options.get("version", 1) < 2:
+            if segment is None:
+                return self.options["filter"]["filter_lines"]
+            return self.options["filter"]["filter_lines"][segment]
+
+        # Compact editor files only store intervals, the filter script of a segment is generated on first use
+        if segment not in self.filter_lines_cache:
+            if segment is None:
+                generator = FilterGenerator(self.__get_config_intervals(None))
+            else:
+                generator = FilterGenerator([self.__get_config_intervals(segment)], segmented=True)
+
+            generator.generate(**self.options["render_options"])
+            filter_lines = generator.get_filter()["filter_lines"]
 
-        return filename
+            self.filter_lines_cache[segment] = filter_lines if segment is None else filter_lines[0]
 
-    def __generate_command(self, filter_filename, segment_file_suffix=""):
+        return self.filter_lines_cache[segment]
+
+    def __generate_seek_flags(self, segment):
+        segment_ranges = self.options["filter"].get("segment_ranges")
+
+        # Editor files without segment ranges contain absolute trims and have to be rendered from the start
+        if segment is None or not segment_ranges:
+            return []
+
+        start, end = segment_ranges[segment]
+        if end <= start:
+            return []
+
+        return ["-ss", str(start), "-t", str(end - start)]
+
+    def __generate_command(self, filter_file, output, segment=None, threads=None):
         command = [
             "ffmpeg",
+            *self.__generate_seek_flags(segment),
             "-i", self.options["input_media_file"],
             "-vsync", "1", "-async", "1",
             "-safe", "0",
-            "-filter_complex_script", filter_filename,
+            "-filter_complex_script", filter_file,
             "-y"
         ]
 
-        if self.options["custom_flags"]:
+        if threads:
+            command.extend(["-threads", str(threads), "-filter_complex_threads", str(threads)])
+
+        if isinstance(self.options["custom_flags"], list):
+            command.extend(self.options["custom_flags"])
+        elif self.options["custom_flags"]:
             command.append(self.options["custom_flags"])
 
         if not self.options["filter"]["audio_only"]:
@@ -49,75 +122,184 @@ class MediaEditor:
             ])
 
         command.extend([
-            "-map", f'[{self.options["filter"]["output"]["audio_pad"]}]',
-            self.options["output_media_file"].format(segment=segment_file_suffix)
+            "-map", f'[{self.options["filter"]["output"]["audio_pad"]}]'
         ])
 
+        if isinstance(output, OutputStream):
+            command.extend(output.get_format_flags())
+
+        command.append(output)
+
         return command
 
-    def edit(self, segment=-1):
-        if not self.options["filter"]["segmented"] or segment >= 0:
-            if not self.options["filter"]["segmented"]:
-                filter_filename = self.__generate_temp_file(self.options["filter"]["filter_lines"])
-                command = self.__generate_command(filter_filename)
+    def get_manifest_filename(self):
+        return self.options["output_media_file"].format(segment="") + ".manifest.json"
+
+    def __load_manifest(self):
+        try:
+            with open(self.get_manifest_filename(), "r") as f:
+                return json.loads(f.read())
+        except (OSError, ValueError):
+            return {}
+
+    def __store_manifest(self, manifest):
+        manifest_filename = self.get_manifest_filename()
+
+        with open(manifest_filename + ".tmp", "w+") as f:
+            f.write(json.dumps(manifest, indent=4))
+
+        os.replace(manifest_filename + ".tmp", manifest_filename)
+
+    def __remove_manifest(self):
+        try:
+            os.remove(self.get_manifest_filename())
+        except FileNotFoundError:
+            pass
+
+    def __get_segment_hash(self, input_identity, segment):
+        segment_ranges = self.options["filter"].get("segment_ranges")
+
+        segment_data = {
+            "input": input_identity,
+            "filter_lines": self.get_filter_lines(segment),
+            "segment_range": segment_ranges[segment] if segment_ranges else None,
+            "audio_only": self.options["filter"]["audio_only"],
+            "output": self.options["filter"]["output"],
+            "custom_flags": self.options["custom_flags"]
+        }
+
+        return hashlib.sha256(json.dumps(segment_data, sort_keys=True).encode()).hexdigest()
+
+    def prepare_jobs(self, segment=-1, threads=None, skip_segments=()):
+        output_media_file = self.options["output_media_file"]
+
+        if not self.options["filter"]["segmented"]:
+            filter_file = InlineFile(";\n".join(self.get_filter_lines()))
+            temp_files = [filter_file]
+
+            if isinstance(output_media_file, str):
+                output = output_media_file.format(segment="")
             else:
-                filter_filename = self.__generate_temp_file(self.options["filter"]["filter_lines"][segment])
-                command = self.__generate_command(filter_filename, segment_file_suffix=str(segment))
+                output = OutputStream(output_media_file, self.options.get("stream_format", "matroska"))
+                temp_files.append(output)
 
-            console_output = subprocess.run(
-                command,
-                capture_output=True,
-                text=True
-            ).stderr
+            return [("output", self.__generate_command(filter_file, output, threads=threads), temp_files)]
+
+        # Segments are separate files that are combined afterwards, only the combined file can be streamed
+        if not isinstance(output_media_file, str):
+            raise Exception("Segmented renders need an output filename pattern, stream the combined file instead.")
+
+        segments = [segment] if segment >= 0 else range(self.get_segment_count())
 
-            os.remove(filter_filename)
+        jobs = []
+        for i in segments:
+            if i in skip_segments:
+                continue
 
-            return console_output.split("\n")
+            filter_file = InlineFile(";\n".join(self.get_filter_lines(i)))
+            command = self.__generate_command(filter_file, output_media_file.format(segment=str(i)), segment=i,
+                                              threads=threads)
+            jobs.append((f"segment {i}", command, [filter_file]))
+
+        return jobs
+
+    def edit(self, segment=-1, workers=1, threads=None, reuse_segments=False):
+        if not self.options["filter"]["segmented"] or segment >= 0:
+            scheduler = RenderScheduler(instrumentation=self.instrumentation)
+            try:
+                scheduler.run(self.prepare_jobs(segment=segment, threads=threads))
+            finally:
+                self.render_results = list(scheduler.results.values())
+
+            return self.render_results[0]["console_output"]
 
         else:
-            console_output = []
-            for i, segment in enumerate(self.options["filter"]["filter_lines"]):
-                filter_filename = self.__generate_temp_file(self.options["filter"]["filter_lines"][i])
-                command = self.__generate_command(filter_filename, segment_file_suffix=str(i))
+            manifest = self.__load_manifest() if reuse_segments else {}
+            input_identity = get_file_identity(self.options["input_media_file"])
+            segment_hashes = {}
+            reused_segments = set()
+
+            for i in range(self.get_segment_count()):
+                segment_hashes[f"segment {i}"] = self.__get_segment_hash(input_identity, i)
+
+                output_filename = self.options["output_media_file"].format(segment=str(i))
+                if manifest.get(str(i)) == segment_hashes[f"segment {i}"] and os.path.exists(output_filename):
+                    reused_segments.add(i)
+                else:
+                    # The entry is dropped before FFmpeg truncates the file, so a killed render is never reused
+                    manifest.pop(str(i), None)
 
-                console_output_part = subprocess.run(
-                    command,
-                    capture_output=True,
-                    text=True
-                ).stderr
+            # The manifest is only kept when reuse is requested, otherwise a stale one could vouch for new outputs
+            if reuse_segments:
+                self.__store_manifest(manifest)
+            else:
+                self.__remove_manifest()
 
-                os.remove(filter_filename)
+            def on_success(key):
+                if reuse_segments:
+                    manifest[key.split(" ")[1]] = segment_hashes[key]
+                    self.__store_manifest(manifest)
 
-                console_output.append(console_output_part.split("\n"))
+            scheduler = RenderScheduler(max_workers=workers, instrumentation=self.instrumentation)
+            try:
+                scheduler.run(self.prepare_jobs(threads=threads, skip_segments=reused_segments),
+                              on_success=on_success)
+            finally:
+                self.render_results = [
+                    {"returncode": 0, "console_output": [], "reused": True} if i in reused_segments
+                    else scheduler.results.get(f"segment {i}")
+                    for i in range(self.get_segment_count())
+                ]
 
-            return console_output
+            return [result["console_output"] for result in self.render_results]
 
-    def combine(self, segment_filename, output_file, re_encode=False):
+    def prepare_combine(self, segment_filename, output_file, re_encode=False, stream_format="matroska"):
         files = []
-        for i in range(len(self.options["filter"]["filter_lines"])):
+        for i in range(self.get_segment_count()):
             filename = os.path.abspath(segment_filename.format(segment=i))
             files.append(f"file {filename}")
 
-        file_list_filename = self.__generate_temp_file(files, join_sequence="\n")
+        file_list = InlineFile("\n".join(files))
+        temp_files = [file_list]
 
         command = [
             "ffmpeg",
             "-f", "concat",
             "-safe", "0",
-            "-i", file_list_filename
+            "-i", file_list
         ]
 
         if not re_encode:
             command.extend(["-c", "copy"])
 
-        command.append(output_file)
+        command.append("-y")
+
+        if isinstance(output_file, str):
+            command.append(output_file)
+        else:
+            output = OutputStream(output_file, stream_format)
+            command.extend([*output.get_format_flags(), output])
+            temp_files.append(output)
+
+        return command, temp_files
+
+    def combine(self, segment_filename, output_file, re_encode=False, stream_format="matroska"):
+        command, temp_files = self.prepare_combine(segment_filename, output_file, re_encode=re_encode,
+                                                   stream_format=stream_format)
 
-        console_output = subprocess.run(
-            command,
-            capture_output=True,
-            text=True
-        ).stderr
+        try:
+            command, pass_fds = open_pipe_files(command, temp_files)
+            process = subprocess.Popen(
+                command,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                text=True,
+                pass_fds=pass_fds
+            )
+            start_pipe_files(temp_files)
 
-        os.remove(file_list_filename)
+            console_output = process.communicate()[1]
+        finally:
+            close_pipe_files(temp_files)
 
         return console_output.split("\n")
@@ -0,0 +1,189 @@
+import io
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import threading
+
+# Pipes are handed to FFmpeg as /dev/fd paths and inherited file descriptors, which only POSIX systems support
+PIPES_SUPPORTED = os.name == "posix" and os.path.isdir("/dev/fd")
+
+STREAM_FORMATS = {
+    "matroska": (".mkv", ["-f", "matroska"]),
+    "mp4": (".mp4", ["-f", "mp4", "-movflags", "frag_keyframe+empty_moov"])
+}
+
+
+class InlineFile:
+    def __init__(self, content, suffix=".txt"):
+        self.content = content
+        self.suffix = suffix
+
+        self.filename = None
+        self.read_fd = None
+        self.write_fd = None
+        self.thread = None
+
+    def open(self):
+        if not PIPES_SUPPORTED:
+            with tempfile.NamedTemporaryFile("w", suffix=self.suffix, delete=False) as f:
+                f.write(self.content)
+                self.filename = f.name
+
+            return self.filename
+
+        self.read_fd, self.write_fd = os.pipe()
+
+        return f"/dev/fd/{self.read_fd}"
+
+    def get_pass_fds(self):
+        return (self.read_fd,) if self.read_fd is not None else ()
+
+    def __write(self, write_fd):
+        try:
+            with os.fdopen(write_fd, "wb") as f:
+                f.write(self.content.encode())
+        except BrokenPipeError:
+            pass
+
+    def start(self):
+        if self.write_fd is None:
+            return
+
+        # The child holds its own copy of the read end, closing ours lets a write fail instead of block forever
+        os.close(self.read_fd)
+        self.read_fd = None
+
+        self.thread = threading.Thread(target=self.__write, args=(self.write_fd,), daemon=True)
+        self.write_fd = None
+        self.thread.start()
+
+    def close(self):
+        for fd in (self.read_fd, self.write_fd):
+            if fd is not None:
+                os.close(fd)
+        self.read_fd, self.write_fd = None, None
+
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+        if self.filename is not None:
+            os.remove(self.filename)
+            self.filename = None
+
+
+class OutputStream:
+    def __init__(self, target, stream_format="matroska"):
+        if stream_format not in STREAM_FORMATS:
+            raise Exception(f"Unknown stream format '{stream_format}'. Please choose 'matroska' or 'mp4'.")
+
+        self.target = target
+        self.stream_format = stream_format
+
+        self.filename = None
+        self.fd = None
+        self.read_fd = None
+        self.thread = None
+
+    def get_format_flags(self):
+        return STREAM_FORMATS[self.stream_format][1]
+
+    def __get_target_fd(self):
+        try:
+            return self.target.fileno()
+        except (AttributeError, io.UnsupportedOperation):
+            return None
+
+    def open(self):
+        if not PIPES_SUPPORTED:
+            with tempfile.NamedTemporaryFile(suffix=STREAM_FORMATS[self.stream_format][0], delete=False) as f:
+                self.filename = f.name
+
+            return self.filename
+
+        target_fd = self.__get_target_fd()
+        if target_fd is not None:
+            # Buffered data has to reach the descriptor before FFmpeg starts writing to it
+            self.target.flush()
+            self.fd = os.dup(target_fd)
+        else:
+            self.read_fd, self.fd = os.pipe()
+
+        return f"pipe:{self.fd}"
+
+    def get_pass_fds(self):
+        return (self.fd,) if self.fd is not None else ()
+
+    def __copy(self, read_fd):
+        with os.fdopen(read_fd, "rb") as f:
+            shutil.copyfileobj(f, self.target, 1024 * 1024)
+
+    def start(self):
+        if self.read_fd is None:
+            return
+
+        os.close(self.fd)
+        self.fd = None
+
+        self.thread = threading.Thread(target=self.__copy, args=(self.read_fd,), daemon=True)
+        self.read_fd = None
+        self.thread.start()
+
+    def close(self):
+        for fd in (self.fd, self.read_fd):
+            if fd is not None:
+                os.close(fd)
+        self.fd, self.read_fd = None, None
+
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+        if self.filename is not None:
+            if os.path.getsize(self.filename) > 0:
+                with open(self.filename, "rb") as f:
+                    shutil.copyfileobj(f, self.target, 1024 * 1024)
+            os.remove(self.filename)
+            self.filename = None
+
+
+def open_pipe_files(command, pipe_files):
+    command = [part.open() if isinstance(part, (InlineFile, OutputStream)) else part for part in command]
+    pass_fds = tuple(fd for pipe_file in pipe_files for fd in pipe_file.get_pass_fds())
+
+    return command, pass_fds
+
+
+def start_pipe_files(pipe_files):
+    for pipe_file in pipe_files:
+        pipe_file.start()
+
+
+def close_pipe_files(pipe_files):
+    for pipe_file in pipe_files:
+        pipe_file.close()
+
+
+def resolve_input(source):
+    if source == "-":
+        source = sys.stdin.buffer
+
+    if isinstance(source, (str, os.PathLike)):
+        return os.fspath(source), None
+
+    try:
+        source_fd = source.fileno()
+    except (AttributeError, io.UnsupportedOperation):
+        source_fd = None
+
+    # Regular files are reopened through procfs, so every FFmpeg process gets its own independent file offset
+    if source_fd is not None and os.path.isdir("/proc/self/fd") and stat.S_ISREG(os.fstat(source_fd).st_mode):
+        return f"/proc/{os.getpid()}/fd/{source_fd}", None
+
+    # Pipes and in-memory streams can only be read once, but detection and rendering both need the input
+    with tempfile.NamedTemporaryFile(prefix="silence_remover_", delete=False) as f:
+        shutil.copyfileobj(source, f, 1024 * 1024)
+
+    return f.name, f.name
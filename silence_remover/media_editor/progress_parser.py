@@ -0,0 +1,41 @@
+class ProgressParser:
+    def __init__(self):
+        self.values = {}
+
+    @staticmethod
+    def __to_number(value, number_type=float, suffix=""):
+        if value is None:
+            return None
+
+        value = value.strip()
+        if suffix and value.endswith(suffix):
+            value = value[:-len(suffix)]
+
+        try:
+            return number_type(value)
+        except ValueError:
+            return None
+
+    def feed_line(self, line):
+        key, separator, value = line.strip().partition("=")
+        if not separator:
+            return None
+
+        self.values[key] = value
+        if key != "progress":
+            return None
+
+        values, self.values = self.values, {}
+
+        # "out_time_ms" is reported in microseconds as well, it is only used by older FFmpeg versions
+        out_time_us = self.__to_number(values.get("out_time_us", values.get("out_time_ms")), int)
+
+        return {
+            "frame": self.__to_number(values.get("frame"), int),
+            "fps": self.__to_number(values.get("fps")),
+            "bitrate": self.__to_number(values.get("bitrate"), suffix="kbits/s"),
+            "total_size": self.__to_number(values.get("total_size"), int),
+            "out_time": out_time_us / 1000000 if out_time_us is not None else None,
+            "speed": self.__to_number(values.get("speed"), suffix="x"),
+            "progress": values.get("progress")
+        }
@@ -0,0 +1,115 @@
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_EXCEPTION, wait
+from contextlib import nullcontext
+
+from silence_remover.media_editor.progress_parser import ProgressParser
+from silence_remover.media_editor.pipe_io import open_pipe_files, start_pipe_files, close_pipe_files
+
+
+class RenderScheduler:
+    def __init__(self, max_workers=1, instrumentation=None):
+        self.max_workers = max_workers
+        self.instrumentation = instrumentation
+
+        self.results = {}
+        self.processes = {}
+        self.lock = threading.Lock()
+        self.cancelled = threading.Event()
+
+    def __read_progress(self, key, process):
+        parser = ProgressParser()
+
+        for line in process.stdout:
+            progress = parser.feed_line(line)
+            if progress is not None:
+                self.instrumentation.progress("render", progress, job=key)
+
+    def __run_job(self, key, command, temp_files, on_success):
+        try:
+            with self.lock:
+                if self.cancelled.is_set():
+                    return None
+
+                if self.instrumentation is not None:
+                    command = [command[0], "-progress", "pipe:1", "-nostats", *command[1:]]
+
+                command, pass_fds = open_pipe_files(command, temp_files)
+                process = subprocess.Popen(
+                    command,
+                    stdout=subprocess.PIPE if self.instrumentation is not None else subprocess.DEVNULL,
+                    stderr=subprocess.PIPE,
+                    text=True,
+                    pass_fds=pass_fds
+                )
+                start_pipe_files(temp_files)
+                self.processes[key] = process
+
+            span = self.instrumentation.span("render", job=key) if self.instrumentation is not None \
+                else nullcontext()
+
+            with span:
+                if self.instrumentation is not None:
+                    # stderr is drained on a separate thread so neither pipe can fill up and block FFmpeg
+                    console_output = []
+                    stderr_thread = threading.Thread(target=lambda: console_output.append(process.stderr.read()))
+                    stderr_thread.start()
+
+                    self.__read_progress(key, process)
+
+                    stderr_thread.join()
+                    process.wait()
+                    console_output = console_output[0]
+                else:
+                    console_output = process.communicate()[1]
+
+                with self.lock:
+                    del self.processes[key]
+                    self.results[key] = {
+                        "returncode": process.returncode,
+                        "console_output": console_output.split("\n")
+                    }
+
+                if process.returncode != 0 and not self.cancelled.is_set():
+                    raise Exception(f"FFmpeg exited with code {process.returncode} while rendering {key}.")
+
+            if process.returncode == 0 and on_success is not None:
+                with self.lock:
+                    on_success(key)
+
+            return self.results[key]
+
+        finally:
+            close_pipe_files(temp_files)
+
+    def cancel(self):
+        with self.lock:
+            self.cancelled.set()
+
+            for process in self.processes.values():
+                process.kill()
+
+    def run(self, jobs, on_success=None):
+        self.results = {}
+        self.cancelled.clear()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(self.__run_job, key, command, temp_files, on_success)
+                       for key, command, temp_files in jobs]
+
+            done, not_done = wait(futures, return_when=FIRST_EXCEPTION)
+
+            if any(future.exception() is not None for future in done):
+                self.cancel()
+                for future in not_done:
+                    future.cancel()
+
+        for future, (_, _, temp_files) in zip(futures, jobs):
+            if future.cancelled():
+                close_pipe_files(temp_files)
+
+        for future in futures:
+            if not future.cancelled() and future.exception() is not None:
+                raise future.exception()
+
+        return [self.results[key] for key, _, _ in jobs]
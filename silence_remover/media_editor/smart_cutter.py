@@ -0,0 +1,298 @@
+import bisect
+import os
+import shutil
+import subprocess
+import tempfile
+from fractions import Fraction
+
+from silence_remover.filter_generator import FilterGenerator
+from silence_remover.media_editor.render_scheduler import RenderScheduler
+from silence_remover.media_editor.media_editor import MediaEditor
+
+
+class SmartCutter:
+    VIDEO_ENCODERS = {
+        "h264": "libx264",
+        "hevc": "libx265",
+        "vp9": "libvpx-vp9",
+        "av1": "libaom-av1",
+        "mpeg4": "mpeg4"
+    }
+    AUDIO_ENCODERS = {
+        "aac": "aac",
+        "mp3": "libmp3lame",
+        "opus": "libopus",
+        "vorbis": "libvorbis",
+        "flac": "flac"
+    }
+    # Pieces are joined in a container that repeats the parameter sets in-band, the concat demuxer would otherwise
+    # only keep the extradata of the first piece
+    INTERMEDIATE_FORMATS = {
+        "h264": ("ts", ["-bsf:v", "h264_mp4toannexb"]),
+        "hevc": ("ts", ["-bsf:v", "hevc_mp4toannexb"]),
+        "mpeg4": ("ts", []),
+        "vp9": ("mkv", []),
+        "av1": ("mkv", [])
+    }
+    VIDEO_PROFILES = {
+        "h264": {
+            "Constrained Baseline": "baseline",
+            "Baseline": "baseline",
+            "Main": "main",
+            "High": "high",
+            "High 10": "high10",
+            "High 4:2:2": "high422",
+            "High 4:4:4 Predictive": "high444"
+        },
+        "hevc": {
+            "Main": "main",
+            "Main 10": "main10"
+        }
+    }
+
+    def __init__(self, input_media_file, output_media_file, intervals, min_copy_time=2.0, custom_flags="",
+                 instrumentation=None):
+        self.input_media_file = input_media_file
+        self.output_media_file = output_media_file
+        self.intervals = intervals
+        self.min_copy_time = min_copy_time
+        self.custom_flags = custom_flags
+        self.instrumentation = instrumentation
+
+        self.streams = {}
+        self.keyframes = []
+        self.pieces = []
+
+    def __probe(self, *arguments):
+        return subprocess.run(
+            ["ffprobe", "-v", "error", *arguments, self.input_media_file],
+            capture_output=True,
+            text=True
+        ).stdout
+
+    def probe_streams(self):
+        stream_entries = {
+            "v": "stream=codec_name,profile,level,pix_fmt,width,height,r_frame_rate,time_base",
+            "a": "stream=codec_name,sample_rate,channels,channel_layout"
+        }
+
+        for stream_type in ("v", "a"):
+            console_output = self.__probe(
+                "-select_streams", f"{stream_type}:0",
+                "-show_entries", stream_entries[stream_type],
+                "-of", "default=noprint_wrappers=1"
+            )
+            self.streams[stream_type] = dict(
+                line.split("=", 1) for line in console_output.splitlines() if "=" in line
+            )
+
+        if not self.streams["v"]:
+            raise Exception("Smart cutting requires a video stream, please use the regular MediaEditor instead.")
+
+        video_codec = self.streams["v"]["codec_name"]
+        if video_codec not in self.VIDEO_ENCODERS or video_codec not in self.INTERMEDIATE_FORMATS:
+            raise Exception(f"Smart cutting does not support the video codec '{video_codec}'.")
+
+        if self.streams["a"] and self.streams["a"]["codec_name"] not in self.AUDIO_ENCODERS:
+            raise Exception(f"Smart cutting does not support the audio codec '{self.streams['a']['codec_name']}'.")
+
+        return self.streams
+
+    def probe_keyframes(self):
+        if not self.streams:
+            self.probe_streams()
+
+        console_output = self.__probe(
+            "-select_streams", "v:0",
+            "-show_entries", "packet=pts,flags",
+            "-of", "csv=p=0"
+        )
+
+        # The exact pts is kept, the rounded pts_time can land just before a keyframe and make copies start a GOP early
+        time_base = Fraction(self.streams["v"]["time_base"])
+
+        keyframes = []
+        for line in console_output.splitlines():
+            pts, _, flags = line.partition(",")
+            if "K" in flags and pts not in ("", "N/A"):
+                keyframes.append(int(pts) * time_base)
+
+        self.keyframes = sorted(keyframes)
+
+        return self.keyframes
+
+    def get_seek_margin(self):
+        frame_rate = self.streams["v"].get("r_frame_rate", "0/0")
+
+        if frame_rate in ("0/0", ""):
+            return Fraction(1, 1000)
+
+        return 1 / (4 * Fraction(frame_rate))
+
+    def plan(self, audible_speed=1.0, audible_volume=1.0, silent_speed=6.0, silent_volume=0.5):
+        self.pieces = []
+
+        for interval in self.intervals:
+            speed = silent_speed if interval["silent"] else audible_speed
+            volume = silent_volume if interval["silent"] else audible_volume
+
+            if speed <= 0:
+                continue
+
+            start, end = interval["start"], interval["end"]
+
+            # Volume changes only affect the audio, which is rendered separately, so the video can still be copied
+            if speed == 1.0:
+                first_keyframe = bisect.bisect_left(self.keyframes, start)
+                last_keyframe = bisect.bisect_right(self.keyframes, end) - 1
+
+                if 0 <= first_keyframe < last_keyframe and \
+                        self.keyframes[last_keyframe] - self.keyframes[first_keyframe] >= self.min_copy_time:
+                    copy_start, copy_end = self.keyframes[first_keyframe], self.keyframes[last_keyframe]
+                    margin = self.get_seek_margin()
+
+                    # Every boundary sits a fraction of a frame away from its keyframe, a copy seeked there still
+                    # starts at that keyframe and no rounding can move a frame into two pieces
+                    self.__add_piece(start, copy_start - margin, "encode")
+                    self.__add_piece(copy_start + margin, copy_end - margin, "copy")
+                    self.__add_piece(copy_end - margin, end, "encode")
+                    continue
+
+            self.__add_piece(start, end, "encode", speed=speed, volume=volume)
+
+        return self.pieces
+
+    def __add_piece(self, start, end, mode, speed=1.0, volume=1.0):
+        if end - start > 0:
+            self.pieces.append({
+                "start": float(start),
+                "end": float(end),
+                "mode": mode,
+                "speed": speed,
+                "volume": volume
+            })
+
+    def __generate_video_flags(self):
+        video_stream = self.streams["v"]
+        video_codec = video_stream["codec_name"]
+        flags = ["-c:v", self.VIDEO_ENCODERS[video_codec]]
+
+        # Re-encoded pieces have to match the copied ones, otherwise players have to reinitialize at every join
+        profile = self.VIDEO_PROFILES.get(video_codec, {}).get(video_stream.get("profile"))
+        if profile:
+            flags.extend(["-profile:v", profile])
+
+        level = video_stream.get("level", "")
+        if level.isdigit() and int(level) > 0:
+            if video_codec == "h264":
+                flags.extend(["-level:v", str(int(level) / 10)])
+            elif video_codec == "hevc":
+                flags.extend(["-x265-params", f"level-idc={int(level) / 30}"])
+
+        if video_stream.get("pix_fmt"):
+            flags.extend(["-pix_fmt", video_stream["pix_fmt"]])
+        if video_stream.get("r_frame_rate", "0/0") not in ("0/0", ""):
+            flags.extend(["-r", video_stream["r_frame_rate"]])
+
+        return flags
+
+    def generate_piece_command(self, piece, piece_filename):
+        command = [
+            "ffmpeg",
+            "-ss", str(piece["start"]),
+            "-t", str(piece["end"] - piece["start"]),
+            "-i", self.input_media_file,
+            "-map", "0:v:0", "-an", "-sn", "-dn"
+        ]
+
+        if piece["mode"] == "copy":
+            command.extend(["-c", "copy", "-avoid_negative_ts", "make_zero"])
+            command.extend(self.INTERMEDIATE_FORMATS[self.streams["v"]["codec_name"]][1])
+        else:
+            command.extend(self.__generate_video_flags())
+            if piece["speed"] != 1.0:
+                command.extend(["-vf", f"setpts={round(1 / piece['speed'], 4)}*PTS"])
+
+            if isinstance(self.custom_flags, list):
+                command.extend(self.custom_flags)
+            elif self.custom_flags:
+                command.append(self.custom_flags)
+
+        command.extend(["-y", piece_filename])
+
+        return command
+
+    def __prepare_audio_job(self, audio_filename, **kwargs):
+        audio_stream = self.streams["a"]
+
+        # Audio is rendered in one pass, encoding it per piece would add encoder priming gaps at every join
+        generator = FilterGenerator(self.intervals)
+        generator.generate(audio_only=True, **kwargs)
+
+        editor = MediaEditor()
+        editor.set_editor_options(generator.get_filter(), self.input_media_file, audio_filename, custom_flags=[
+            "-c:a", self.AUDIO_ENCODERS[audio_stream["codec_name"]],
+            "-ar", audio_stream["sample_rate"],
+            "-ac", audio_stream["channels"]
+        ])
+
+        _, command, temp_files = editor.prepare_jobs()[0]
+
+        return "audio", command, temp_files
+
+    def verify(self):
+        console_output = subprocess.run(
+            ["ffmpeg", "-v", "error", "-i", self.output_media_file, "-f", "null", "-"],
+            capture_output=True,
+            text=True
+        ).stderr
+
+        return [line for line in console_output.split("\n") if line]
+
+    def render(self, workers=1, verify=False, **kwargs):
+        if not self.streams:
+            self.probe_streams()
+        if not self.keyframes:
+            self.probe_keyframes()
+
+        self.plan(**kwargs)
+
+        intermediate_format = self.INTERMEDIATE_FORMATS[self.streams["v"]["codec_name"]][0]
+
+        temp_directory = tempfile.mkdtemp()
+        try:
+            piece_filenames = [os.path.join(temp_directory, f"piece{i}.{intermediate_format}")
+                               for i in range(len(self.pieces))]
+            audio_filename = os.path.join(temp_directory, "audio.mka")
+
+            jobs = [
+                (f"piece {i}", self.generate_piece_command(piece, piece_filenames[i]), [])
+                for i, piece in enumerate(self.pieces)
+            ]
+            if self.streams["a"]:
+                jobs.append(self.__prepare_audio_job(audio_filename, **kwargs))
+
+            RenderScheduler(max_workers=workers, instrumentation=self.instrumentation).run(jobs)
+
+            file_list_filename = os.path.join(temp_directory, "pieces.txt")
+            with open(file_list_filename, "w+") as f:
+                f.write("\n".join(f"file {filename}" for filename in piece_filenames))
+
+            command = ["ffmpeg", "-f", "concat", "-safe", "0", "-i", file_list_filename]
+            if self.streams["a"]:
+                command.extend(["-i", audio_filename, "-map", "0:v:0", "-map", "1:a:0"])
+            command.extend(["-c", "copy", "-y", self.output_media_file])
+
+            process = subprocess.run(command, capture_output=True, text=True)
+            if process.returncode != 0:
+                raise Exception(f"FFmpeg could not join the pieces of {self.output_media_file}.")
+
+        finally:
+            shutil.rmtree(temp_directory)
+
+        if verify:
+            decode_errors = self.verify()
+            if decode_errors:
+                raise Exception(f"{self.output_media_file} does not decode cleanly:\n" + "\n".join(decode_errors[:10]))
+
+        return process.stderr.split("\n")
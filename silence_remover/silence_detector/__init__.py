@@ -1,2 +1,6 @@
 from silence_remover.silence_detector.silence_detector import SilenceDetector
-from silence_remover.silence_detector.interval_parser import IntervalParser
\ No newline at end of file
+from silence_remover.silence_detector.interval_parser import IntervalParser
+from silence_remover.silence_detector.decode_profile import DecodeProfile
+from silence_remover.silence_detector.chunked_detector import ChunkedDetector
+from silence_remover.silence_detector.segment_planner import SegmentPlanner
+from silence_remover.silence_detector.detection_cache import DetectionCache
@@ -0,0 +1,138 @@
+import os
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+from silence_remover.silence_detector.interval_parser import IntervalParser
+from silence_remover.silence_detector.decode_profile import DecodeProfile
+
+
+class ChunkedDetector:
+    def __init__(self, filename, workers=None, decode_profile=None, min_chunk_time=30.0, tolerance=1e-3):
+        self.filename = filename
+        self.workers = workers or os.cpu_count() or 1
+        self.decode_profile = decode_profile or DecodeProfile()
+        self.min_chunk_time = min_chunk_time
+        self.tolerance = tolerance
+
+        self.media_duration = 0.0
+
+    def probe_duration(self):
+        console_output = subprocess.run(
+            ["ffprobe", "-v", "error",
+             "-show_entries", "format=duration",
+             "-of", "default=noprint_wrappers=1:nokey=1",
+             self.filename],
+            capture_output=True,
+            text=True
+        ).stdout
+
+        try:
+            self.media_duration = float(console_output.strip())
+        except ValueError:
+            raise Exception(f"FFprobe could not determine the duration of {self.filename}.")
+
+        return self.media_duration
+
+    def detect_range(self, start, duration, silence_level_db, silence_time_threshold):
+        audio_filters = self.decode_profile.get_filters() + [
+            f"silencedetect=noise={silence_level_db}dB:d={silence_time_threshold}"
+        ]
+
+        process = subprocess.run(
+            ["ffmpeg", "-ss", str(start), "-t", str(duration), "-i", self.filename,
+             *self.decode_profile.get_stream_flags(),
+             "-af", ",".join(audio_filters),
+             "-f", "null", "-"],
+            capture_output=True,
+            text=True
+        )
+
+        if process.returncode != 0:
+            raise Exception(f"FFmpeg exited with code {process.returncode} while detecting silence in "
+                            f"{self.filename} from {start}s.")
+
+        parser = IntervalParser()
+        for line in process.stderr.split("\n"):
+            parser.feed_line(line)
+        parser.close_open_interval(duration)
+
+        intervals = []
+        for interval in parser.get_intervals():
+            interval_start = start + max(interval["start"], 0)
+            interval_end = start + min(interval["end"], duration)
+            intervals.append({
+                "start": interval_start,
+                "silent": True,
+                "end": interval_end,
+                "duration": interval_end - interval_start
+            })
+
+        return intervals
+
+    def __get_boundary_window(self, boundary, silence_time_threshold):
+        return (
+            max(boundary - silence_time_threshold, 0),
+            min(boundary + silence_time_threshold, self.media_duration)
+        )
+
+    def __detect_boundary(self, boundary, silence_level_db, silence_time_threshold):
+        window_start, window_end = self.__get_boundary_window(boundary, silence_time_threshold)
+
+        return self.detect_range(window_start, window_end - window_start, silence_level_db, 0)
+
+    def __stitch_boundary(self, chunk_intervals, index, boundary, runs, silence_time_threshold):
+        window_start, window_end = self.__get_boundary_window(boundary, silence_time_threshold)
+
+        runs = [run for run in runs
+                if run["start"] <= boundary + self.tolerance and run["end"] >= boundary - self.tolerance]
+
+        if not runs:
+            return
+
+        run_start, run_end = runs[0]["start"], runs[-1]["end"]
+        left_intervals, right_intervals = chunk_intervals[index], chunk_intervals[index + 1]
+
+        if window_start > 0 and run_start <= window_start + self.tolerance and left_intervals:
+            run_start = min(run_start, left_intervals[-1]["start"])
+
+        if window_end < self.media_duration and run_end >= window_end - self.tolerance and right_intervals:
+            run_end = max(run_end, right_intervals[0]["end"])
+
+        while left_intervals and left_intervals[-1]["end"] >= run_start - self.tolerance:
+            run_start = min(run_start, left_intervals.pop()["start"])
+
+        while right_intervals and right_intervals[0]["start"] <= run_end + self.tolerance:
+            run_end = max(run_end, right_intervals.pop(0)["end"])
+
+        if run_end - run_start >= silence_time_threshold:
+            right_intervals.insert(0, {
+                "start": run_start,
+                "silent": True,
+                "end": run_end,
+                "duration": run_end - run_start
+            })
+
+    def detect(self, silence_level_db=-35, silence_time_threshold=0.5):
+        self.probe_duration()
+
+        chunk_count = max(1, min(self.workers, int(self.media_duration // self.min_chunk_time)))
+        boundaries = [self.media_duration * i / chunk_count for i in range(chunk_count + 1)]
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            chunk_futures = [
+                executor.submit(self.detect_range, boundaries[i], boundaries[i + 1] - boundaries[i],
+                                silence_level_db, silence_time_threshold)
+                for i in range(chunk_count)
+            ]
+            boundary_futures = [
+                executor.submit(self.__detect_boundary, boundary, silence_level_db, silence_time_threshold)
+                for boundary in boundaries[1:-1]
+            ]
+
+            chunk_intervals = [future.result() for future in chunk_futures]
+            boundary_runs = [future.result() for future in boundary_futures]
+
+        for i, boundary in enumerate(boundaries[1:-1]):
+            self.__stitch_boundary(chunk_intervals, i, boundary, boundary_runs[i], silence_time_threshold)
+
+        return [interval for intervals in chunk_intervals for interval in intervals]
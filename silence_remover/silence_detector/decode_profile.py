@@ -0,0 +1,23 @@
+class DecodeProfile:
+    def __init__(self, audio_track=0, channels=None, sample_rate=None):
+        self.audio_track = audio_track
+        self.channels = channels
+        self.sample_rate = sample_rate
+
+    def get_stream_flags(self):
+        return ["-map", f"0:a:{self.audio_track}", "-vn", "-sn", "-dn"]
+
+    def get_filters(self):
+        format_options = []
+
+        if self.sample_rate:
+            format_options.append(f"sample_rates={self.sample_rate}")
+
+        if self.channels:
+            channel_layout = {1: "mono", 2: "stereo"}.get(self.channels, f"{self.channels}c")
+            format_options.append(f"channel_layouts={channel_layout}")
+
+        if not format_options:
+            return []
+
+        return ["aformat=" + ":".join(format_options)]
@@ -0,0 +1,92 @@
+import hashlib
+import json
+import os
+import tempfile
+
+from silence_remover.file_identity import get_file_identity
+
+
+class DetectionCache:
+    def __init__(self, cache_dir=None, max_size=64 * 1024 * 1024):
+        self.cache_dir = cache_dir or os.path.join(os.path.expanduser("~"), ".cache", "silence_remover", "detection")
+        self.max_size = max_size
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def get_key(self, filename, **detection_options):
+        key_data = {
+            "file": get_file_identity(filename),
+            "options": detection_options
+        }
+
+        return hashlib.sha256(json.dumps(key_data, sort_keys=True).encode()).hexdigest()
+
+    def __get_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def load(self, key):
+        path = self.__get_path(key)
+
+        try:
+            with open(path, "r") as f:
+                result = json.loads(f.read())
+        except (OSError, ValueError):
+            return None
+
+        # Touching the entry keeps the modification time usable as LRU order
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+
+        return result
+
+    def store(self, key, silent_intervals, media_duration):
+        # Every writer gets its own temp file, threads of one process can store the same key at once
+        file_descriptor, temp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=f"{key}.", suffix=".tmp")
+
+        try:
+            with os.fdopen(file_descriptor, "w") as f:
+                f.write(json.dumps({
+                    "silent_intervals": silent_intervals,
+                    "media_duration": media_duration
+                }))
+
+            os.replace(temp_path, self.__get_path(key))
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+        self.__evict()
+
+    def __evict(self):
+        entries = []
+        for filename in os.listdir(self.cache_dir):
+            if filename.endswith(".json"):
+                # Other processes evict from the same directory and can remove an entry after it was listed
+                try:
+                    stat = os.stat(os.path.join(self.cache_dir, filename))
+                except FileNotFoundError:
+                    continue
+
+                entries.append((stat.st_mtime, stat.st_size, filename))
+
+        total_size = sum(size for _, size, _ in entries)
+
+        for _, size, filename in sorted(entries):
+            if total_size <= self.max_size:
+                break
+
+            try:
+                os.remove(os.path.join(self.cache_dir, filename))
+            except FileNotFoundError:
+                pass
+            total_size -= size
+
+    def clear(self):
+        for filename in os.listdir(self.cache_dir):
+            if filename.endswith(".json"):
+                try:
+                    os.remove(os.path.join(self.cache_dir, filename))
+                except FileNotFoundError:
+                    pass
@@ -0,0 +1,111 @@
+import subprocess
+
+import numpy as np
+
+from silence_remover.silence_detector.decode_profile import DecodeProfile
+
+
+class EnvelopeDetector:
+    def __init__(self, filename, sample_rate=16000, window_time=0.01, audio_track=0):
+        self.filename = filename
+        self.sample_rate = sample_rate
+        self.window_time = window_time
+        self.decode_profile = DecodeProfile(audio_track=audio_track, sample_rate=sample_rate)
+
+        self.channels = None
+        self.levels = None
+        self.media_duration = 0.0
+
+    def probe_channels(self):
+        console_output = subprocess.run(
+            ["ffprobe", "-v", "error", "-select_streams", f"a:{self.decode_profile.audio_track}",
+             "-show_entries", "stream=channels", "-of", "default=noprint_wrappers=1:nokey=1", self.filename],
+            capture_output=True,
+            text=True
+        ).stdout
+
+        try:
+            self.channels = int(console_output.split()[0])
+        except (ValueError, IndexError):
+            raise Exception(f"FFprobe could not find audio track {self.decode_profile.audio_track} in {self.filename}.")
+
+        return self.channels
+
+    def __generate_command(self):
+        return [
+            "ffmpeg", "-i", self.filename,
+            *self.decode_profile.get_stream_flags(),
+            "-af", ",".join(self.decode_profile.get_filters()),
+            "-f", "f32le", "pipe:"
+        ]
+
+    @staticmethod
+    def window_levels(windows):
+        # silencedetect compares every sample of every channel against the noise level, so a window is only
+        # silent when its peak is below it, an RMS level would sit 3 to 12 dB lower and mark quiet speech silent
+        peak = np.max(np.abs(windows), axis=1)
+        return 20 * np.log10(np.maximum(peak, 1e-10))
+
+    def compute_envelope(self):
+        if self.channels is None:
+            self.probe_channels()
+
+        # Windows hold the interleaved samples of all channels
+        window_size = max(1, int(round(self.sample_rate * self.window_time))) * self.channels
+        chunk_size = window_size * 4 * 1024
+
+        process = subprocess.Popen(
+            self.__generate_command(),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+
+        levels = []
+        sample_count = 0
+        remainder = np.empty(0, dtype=np.float32)
+
+        while True:
+            data = process.stdout.read(chunk_size)
+            if not data:
+                break
+
+            samples = np.frombuffer(data, dtype="<f4")
+            sample_count += len(samples)
+
+            if len(remainder) > 0:
+                samples = np.concatenate((remainder, samples))
+
+            full_length = len(samples) - len(samples) % window_size
+            if full_length > 0:
+                levels.append(self.window_levels(samples[:full_length].reshape(-1, window_size)))
+            remainder = samples[full_length:]
+
+        if len(remainder) > 0:
+            levels.append(self.window_levels(remainder.reshape(1, -1)))
+
+        process.stdout.close()
+        if process.wait() != 0:
+            raise Exception(f"FFmpeg could not decode the audio of {self.filename}.")
+
+        self.levels = np.concatenate(levels) if levels else np.empty(0)
+        self.media_duration = sample_count / self.channels / self.sample_rate
+
+        return self
+
+    def detect_intervals(self, silence_level_db=-35, silence_time_threshold=0.5):
+        silent = np.concatenate(([0], (self.levels < silence_level_db).astype(np.int8), [0]))
+        edges = np.diff(silent)
+
+        start_times = np.flatnonzero(edges == 1) * self.window_time
+        end_times = np.minimum(np.flatnonzero(edges == -1) * self.window_time, self.media_duration)
+        keep = end_times - start_times >= silence_time_threshold
+
+        return [
+            {
+                "start": float(start),
+                "silent": True,
+                "end": float(end),
+                "duration": float(end - start)
+            }
+            for start, end in zip(start_times[keep], end_times[keep])
+        ]
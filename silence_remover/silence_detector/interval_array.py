@@ -0,0 +1,150 @@
+import numpy as np
+
+from silence_remover.silence_detector.interval_parser import IntervalParser
+
+
+class IntervalArray:
+    def __init__(self, starts=(), ends=(), silent=(), durations=None, remove=None, media_duration=0.0):
+        self.starts = np.asarray(starts, dtype=np.float64)
+        self.ends = np.asarray(ends, dtype=np.float64)
+        self.silent = np.asarray(silent, dtype=bool)
+        self.durations = self.ends - self.starts if durations is None else np.asarray(durations, dtype=np.float64)
+        self.remove = np.zeros(len(self.starts), dtype=bool) if remove is None else np.asarray(remove, dtype=bool)
+        self.media_duration = media_duration
+
+        self.short_interval_threshold = None
+
+    @classmethod
+    def from_intervals(cls, intervals, media_duration=0.0):
+        return cls(
+            starts=[interval["start"] for interval in intervals],
+            ends=[interval["end"] for interval in intervals],
+            silent=[interval["silent"] for interval in intervals],
+            durations=[interval["duration"] for interval in intervals],
+            remove=["remove" in interval for interval in intervals],
+            media_duration=media_duration
+        )
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __set_columns(self, starts, ends, silent, durations, remove=None):
+        self.starts = starts
+        self.ends = ends
+        self.silent = silent
+        self.durations = durations
+        self.remove = np.zeros(len(starts), dtype=bool) if remove is None else remove
+
+    def insert_additional_intervals(self):
+        if len(self) == 0:
+            self.__set_columns(np.array([0.0]), np.array([self.media_duration]), np.array([False]),
+                               np.array([self.media_duration]))
+
+            return self
+
+        starts, ends, silent, durations, remove = self.starts, self.ends, self.silent, self.durations, self.remove
+
+        if starts[0] != 0:
+            starts = np.concatenate(([0.0], starts))
+            ends = np.concatenate(([self.starts[0]], ends))
+            silent = np.concatenate(([not self.silent[0]], silent))
+            durations = np.concatenate(([self.starts[0]], durations))
+            remove = np.concatenate(([False], remove))
+
+        if ends[-1] != self.media_duration:
+            starts = np.concatenate((starts, [ends[-1]]))
+            silent = np.concatenate((silent, [not silent[-1]]))
+            durations = np.concatenate((durations, [self.media_duration - ends[-1]]))
+            remove = np.concatenate((remove, [False]))
+            ends = np.concatenate((ends, [self.media_duration]))
+
+        gap_starts, gap_ends = ends[:-1], starts[1:]
+        has_gap = gap_ends - gap_starts > 0
+
+        # Every interval moves back by the number of gaps inserted before it
+        positions = np.arange(len(starts)) + np.concatenate(([0], np.cumsum(has_gap)))
+        gap_positions = positions[:-1][has_gap] + 1
+        size = len(starts) + len(gap_positions)
+
+        new_starts, new_ends, new_durations = np.empty(size), np.empty(size), np.empty(size)
+        new_silent, new_remove = np.zeros(size, dtype=bool), np.zeros(size, dtype=bool)
+
+        new_starts[positions], new_ends[positions] = starts, ends
+        new_silent[positions], new_durations[positions], new_remove[positions] = silent, durations, remove
+
+        new_starts[gap_positions], new_ends[gap_positions] = gap_starts[has_gap], gap_ends[has_gap]
+        new_durations[gap_positions] = gap_ends[has_gap] - gap_starts[has_gap]
+
+        self.__set_columns(new_starts, new_ends, new_silent, new_durations, new_remove)
+
+        return self
+
+    def mark_short_intervals(self, short_interval_threshold=0.3):
+        self.short_interval_threshold = short_interval_threshold
+        self.remove = self.remove | (self.durations <= short_interval_threshold)
+
+        return self
+
+    def combine_and_remove_intervals(self):
+        if len(self) == 0:
+            self.__set_columns(np.array([0.0]), np.array([0.0]), np.array([False]), np.array([0.0]))
+
+            return self
+
+        kept = np.flatnonzero(~self.remove)
+
+        # A kept interval opens a new group when it differs from the previous kept one,
+        # removed intervals are always absorbed into the group before them
+        group_flags = np.zeros(len(self), dtype=bool)
+        group_flags[kept[1:]] = self.silent[kept[1:]] != self.silent[kept[:-1]]
+        group_starts = np.flatnonzero(group_flags)
+
+        first_indices = np.concatenate(([0], group_starts))
+        last_indices = np.concatenate((group_starts - 1, [len(self) - 1]))
+
+        starts = self.starts[first_indices]
+        starts[0] = 0.0
+
+        silent = self.silent[first_indices]
+        silent[0] = self.silent[kept[0]] if len(kept) > 0 else False
+
+        self.__set_columns(starts, self.ends[last_indices], silent, np.add.reduceat(self.durations, first_indices))
+
+        return self
+
+    def stretch_audible_intervals(self, stretch_time=0.25):
+        if self.short_interval_threshold is not None and stretch_time > self.short_interval_threshold:
+            raise Exception(
+                "Since the ShortIntervalThreshold is larger than the StretchTime, negative Intervals are possible.\n"
+                "Please choose other values.")
+
+        stretch_time_part = np.where(self.silent, stretch_time / 2, -stretch_time / 2)
+        starts = self.starts + stretch_time_part
+        ends = self.ends - stretch_time_part
+
+        if len(self) > 0:
+            starts[0] = self.starts[0]
+            ends[-1] = self.ends[-1]
+
+        self.__set_columns(starts, ends, self.silent, ends - starts, self.remove)
+
+        return self
+
+    def split_intervals(self, max_interval_time):
+        # Splitting is a single pass over the few intervals left after combining, it reuses the parser so both
+        # backends cut the same segments
+        parser = IntervalParser().load_intervals(self.get_intervals(), self.media_duration)
+
+        return parser.split_intervals(max_interval_time)
+
+    def get_intervals(self):
+        intervals = []
+        for start, end, silent, duration, remove in zip(self.starts.tolist(), self.ends.tolist(),
+                                                        self.silent.tolist(), self.durations.tolist(),
+                                                        self.remove.tolist()):
+            interval = {"start": start, "end": end, "silent": silent, "duration": duration}
+            if remove:
+                interval["remove"] = True
+            intervals.append(interval)
+
+        return intervals
@@ -2,7 +2,7 @@ import re
 
 
 class IntervalParser:
-    def __init__(self, console_output_array):
+    def __init__(self, console_output_array=None):
         self.console_output_array = console_output_array
 
         self.intervals = []
@@ -10,30 +10,58 @@ class IntervalParser:
 
         self.short_interval_threshold = None
 
+        self.prev_time = 0
+        self.current_interval = {}
+
+    def feed_line(self, line):
+        if line.startswith("[silencedetect"):
+            capture = re.search("\[silencedetect @ [0-9xa-f]+] silence_([a-z]+): (-?[0-9]+.?[0-9]*[e-]*[0-9]*)",
+                                line)
+            event = capture[1]
+            time = float(capture[2])
+
+            self.current_interval[event] = time
+            self.current_interval["silent"] = True
+            prev_time = self.prev_time
+            self.prev_time = time
+
+            if event == "end":
+                finished_interval = self.current_interval
+                finished_interval["duration"] = time - prev_time
+                self.intervals.append(finished_interval)
+                self.current_interval = {}
+
+                return finished_interval
+
+        elif line.startswith("  Duration"):
+            capture = re.search("  Duration: ([0-9:]+.?[0-9]*)", line)
+            hour, minute, second_millisecond = capture[1].split(":")
+            second, millisecond = second_millisecond.split(".")
+            self.media_duration = float(str(int(second) + 60 * (int(minute) + 60 * int(hour))) + "." + millisecond)
+
+        return None
+
+    def close_open_interval(self, end_time):
+        if "start" not in self.current_interval:
+            return None
+
+        finished_interval = self.current_interval
+        finished_interval["end"] = end_time
+        finished_interval["duration"] = end_time - finished_interval["start"]
+        self.intervals.append(finished_interval)
+        self.current_interval = {}
+
+        return finished_interval
+
     def parse_console_output(self):
-        prev_time = 0
-        current_interval = {}
-
-        for i, line in enumerate(self.console_output_array):
-            if line.startswith("[silencedetect"):
-                capture = re.search("\[silencedetect @ [0-9xa-f]+] silence_([a-z]+): (-?[0-9]+.?[0-9]*[e-]*[0-9]*)",
-                                    line)
-                event = capture[1]
-                time = float(capture[2])
-
-                current_interval[event] = time
-                current_interval["silent"] = True
-                if event == "end":
-                    current_interval["duration"] = time - prev_time
-                    self.intervals.append(current_interval)
-                    current_interval = {}
-                prev_time = time
-
-            elif line.startswith("  Duration"):
-                capture = re.search("  Duration: ([0-9:]+.?[0-9]*)", line)
-                hour, minute, second_millisecond = capture[1].split(":")
-                second, millisecond = second_millisecond.split(".")
-                self.media_duration = float(str(int(second) + 60 * (int(minute) + 60 * int(hour))) + "." + millisecond)
+        for line in self.console_output_array:
+            self.feed_line(line)
+
+        return self
+
+    def load_intervals(self, intervals, media_duration):
+        self.intervals = [interval.copy() for interval in intervals]
+        self.media_duration = media_duration
 
         return self
 
@@ -58,13 +86,24 @@ class IntervalParser:
             self.intervals.append(current_interval)
 
     def insert_additional_intervals(self):
+        if not self.intervals:
+            self.intervals = [{
+                "start": 0,
+                "end": self.media_duration,
+                "duration": self.media_duration,
+                "silent": False
+            }]
+
+            return self
+
         self.__add_start_interval()
         self.__add_end_interval()
 
-        intervals = self.intervals[::]
+        intervals = []
 
-        insert_counter = 1
         for i, interval in enumerate(self.intervals):
+            intervals.append(interval)
+
             if i <= len(self.intervals) - 2:
                 start = interval["end"]
                 end = self.intervals[i + 1]["start"]
@@ -76,8 +115,7 @@ class IntervalParser:
                         "duration": end - start,
                         "silent": False
                     }
-                    intervals.insert(i + insert_counter, current_interval)
-                    insert_counter += 1
+                    intervals.append(current_interval)
 
         self.intervals = intervals
 
@@ -132,7 +170,7 @@ class IntervalParser:
 
             if i == 0:
                 new_start = item["start"]
-            elif i == len(self.intervals) - 1:
+            if i == len(self.intervals) - 1:
                 new_end = item["end"]
 
             item["start"] = new_start
@@ -0,0 +1,62 @@
+from silence_remover.silence_detector.envelope_detector import EnvelopeDetector
+from silence_remover.silence_detector.interval_array import IntervalArray
+
+
+class ParameterSweep:
+    def __init__(self, filename, audio_track=0, sample_rate=16000, window_time=0.01):
+        self.detector = EnvelopeDetector(
+            filename,
+            sample_rate=sample_rate,
+            window_time=window_time,
+            audio_track=audio_track
+        )
+
+    def compute_envelope(self):
+        self.detector.compute_envelope()
+
+        return self
+
+    def run(self, silence_levels_db, silence_time_thresholds, short_interval_threshold=0.3, stretch_time=0.25,
+            audible_speed=1.0, silent_speed=6.0):
+        if self.detector.levels is None:
+            self.compute_envelope()
+
+        media_duration = self.detector.media_duration
+        speeds = {
+            True: silent_speed,
+            False: audible_speed
+        }
+
+        results = []
+        for silence_level_db in silence_levels_db:
+            for silence_time_threshold in silence_time_thresholds:
+                silent_intervals = self.detector.detect_intervals(
+                    silence_level_db=silence_level_db,
+                    silence_time_threshold=silence_time_threshold
+                )
+
+                intervals = (
+                    IntervalArray.from_intervals(silent_intervals, media_duration)
+                    .insert_additional_intervals()
+                    .mark_short_intervals(short_interval_threshold=short_interval_threshold)
+                    .combine_and_remove_intervals()
+                    .stretch_audible_intervals(stretch_time=stretch_time)
+                    .get_intervals()
+                )
+
+                silent_duration = sum(interval["duration"] for interval in intervals if interval["silent"])
+                output_duration = sum(
+                    interval["duration"] / speeds[interval["silent"]]
+                    for interval in intervals if speeds[interval["silent"]] > 0
+                )
+
+                results.append({
+                    "silence_level_db": silence_level_db,
+                    "silence_time_threshold": silence_time_threshold,
+                    "silent_fraction": silent_duration / media_duration if media_duration > 0 else 0.0,
+                    "cuts": max(len(intervals) - 1, 0),
+                    "output_duration": output_duration,
+                    "intervals": intervals
+                })
+
+        return results
@@ -0,0 +1,92 @@
+import bisect
+
+
+class SegmentPlanner:
+    def __init__(self, intervals, audible_speed=1.0, silent_speed=6.0, decode_cost=0.25, encode_cost=1.0):
+        self.intervals = intervals
+        self.speeds = {
+            True: silent_speed,
+            False: audible_speed
+        }
+        self.decode_cost = decode_cost
+        self.encode_cost = encode_cost
+
+        self.segment_estimates = []
+
+    def get_output_duration(self, interval):
+        speed = self.speeds[interval["silent"]]
+        return interval["duration"] / speed if speed > 0 else 0.0
+
+    def get_cost(self, interval):
+        return interval["duration"] * self.decode_cost + self.get_output_duration(interval) * self.encode_cost
+
+    def __find_cut_times(self, segment_count):
+        cumulative_costs = [0.0]
+        for interval in self.intervals:
+            cumulative_costs.append(cumulative_costs[-1] + self.get_cost(interval))
+
+        target_cost = cumulative_costs[-1] / segment_count
+        cut_times = []
+
+        for k in range(1, segment_count):
+            cost = k * target_cost
+            i = min(bisect.bisect_right(cumulative_costs, cost) - 1, len(self.intervals) - 1)
+            interval = self.intervals[i]
+
+            if interval["silent"]:
+                interval_cost = cumulative_costs[i + 1] - cumulative_costs[i]
+                fraction = (cost - cumulative_costs[i]) / interval_cost if interval_cost > 0 else 0.5
+                cut_time = interval["start"] + fraction * interval["duration"]
+            elif cost - cumulative_costs[i] < cumulative_costs[i + 1] - cost:
+                cut_time = interval["start"]
+            else:
+                cut_time = interval["end"]
+
+            if self.intervals[0]["start"] < cut_time < self.intervals[-1]["end"] and \
+                    (not cut_times or cut_time > cut_times[-1]):
+                cut_times.append(cut_time)
+
+        return cut_times
+
+    def plan(self, segment_count):
+        if not self.intervals or segment_count <= 1:
+            segments = [self.intervals]
+        else:
+            segments = [[]]
+            cut_times = self.__find_cut_times(segment_count)
+            cut_index = 0
+
+            for interval in self.intervals:
+                interval = interval.copy()
+
+                while cut_index < len(cut_times) and cut_times[cut_index] <= interval["start"]:
+                    segments.append([])
+                    cut_index += 1
+
+                while cut_index < len(cut_times) and cut_times[cut_index] < interval["end"]:
+                    cut_time = cut_times[cut_index]
+                    head = interval.copy()
+                    head["end"] = cut_time
+                    head["duration"] = cut_time - head["start"]
+                    segments[-1].append(head)
+                    segments.append([])
+
+                    interval["start"] = cut_time
+                    interval["duration"] = interval["end"] - cut_time
+                    cut_index += 1
+
+                segments[-1].append(interval)
+
+            segments = [segment for segment in segments if segment]
+
+        self.segment_estimates = [
+            {
+                "start": segment[0]["start"] if segment else 0,
+                "end": segment[-1]["end"] if segment else 0,
+                "output_duration": sum(self.get_output_duration(interval) for interval in segment),
+                "cost": sum(self.get_cost(interval) for interval in segment)
+            }
+            for segment in segments
+        ]
+
+        return segments
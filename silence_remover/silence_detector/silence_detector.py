@@ -1,38 +1,194 @@
 import subprocess
 
 from silence_remover.silence_detector.interval_parser import IntervalParser
+from silence_remover.silence_detector.decode_profile import DecodeProfile
+from silence_remover.silence_detector.chunked_detector import ChunkedDetector
+from silence_remover.silence_detector.segment_planner import SegmentPlanner
 
 
 class SilenceDetector:
-    def __init__(self, filename):
+    def __init__(self, filename, engine="ffmpeg", cache=None):
+        if engine not in ("ffmpeg", "numpy"):
+            raise Exception(f"Unknown detection engine '{engine}'. Please choose 'ffmpeg' or 'numpy'.")
+
         self.filename = filename
-        self.console_output_array = None
+        self.engine = engine
+        self.cache = cache
+        self.silent_intervals = None
+        self.media_duration = 0.0
         self.detected_intervals = None
 
-    def detect(self, silence_level_db=-35, silence_time_threshold=0.5):
-        console_output = subprocess.run(
-            ["ffmpeg", "-i", self.filename, "-af",
-             f"silencedetect=noise={silence_level_db}dB:d={silence_time_threshold}",
-             "-f", "null", "-"],
-            capture_output=True,
+    def generate_command(self, silence_level_db=-35, silence_time_threshold=0.5, audio_track=0,
+                         analysis_channels=None, analysis_sample_rate=None):
+        decode_profile = DecodeProfile(
+            audio_track=audio_track,
+            channels=analysis_channels,
+            sample_rate=analysis_sample_rate
+        )
+        audio_filters = decode_profile.get_filters() + [
+            f"silencedetect=noise={silence_level_db}dB:d={silence_time_threshold}"
+        ]
+
+        return [
+            "ffmpeg", "-i", self.filename,
+            *decode_profile.get_stream_flags(),
+            "-af", ",".join(audio_filters),
+            "-f", "null", "-"
+        ]
+
+    def detect(self, silence_level_db=-35, silence_time_threshold=0.5, **kwargs):
+        for _ in self.detect_iter(silence_level_db=silence_level_db,
+                                  silence_time_threshold=silence_time_threshold, **kwargs):
+            pass
+
+        return self.silent_intervals
+
+    def detect_iter(self, silence_level_db=-35, silence_time_threshold=0.5, audio_track=0,
+                    analysis_channels=None, analysis_sample_rate=None, analysis_window_time=0.01, **kwargs):
+        if self.cache is None:
+            yield from self.__detect_iter(silence_level_db, silence_time_threshold, audio_track=audio_track,
+                                          analysis_channels=analysis_channels,
+                                          analysis_sample_rate=analysis_sample_rate,
+                                          analysis_window_time=analysis_window_time, **kwargs)
+            return
+
+        cache_key = self.cache.get_key(
+            self.filename,
+            engine=self.engine,
+            silence_level_db=silence_level_db,
+            silence_time_threshold=silence_time_threshold,
+            audio_track=audio_track,
+            analysis_channels=analysis_channels,
+            analysis_sample_rate=analysis_sample_rate,
+            analysis_window_time=analysis_window_time if self.engine == "numpy" else None
+        )
+        cached_result = self.cache.load(cache_key)
+
+        if cached_result is not None:
+            self.silent_intervals = cached_result["silent_intervals"]
+            self.media_duration = cached_result["media_duration"]
+            yield from self.silent_intervals
+            return
+
+        yield from self.__detect_iter(silence_level_db, silence_time_threshold, audio_track=audio_track,
+                                      analysis_channels=analysis_channels,
+                                      analysis_sample_rate=analysis_sample_rate,
+                                      analysis_window_time=analysis_window_time, **kwargs)
+
+        # A zero duration means nothing was decoded, caching it would hide the problem on every later run
+        if self.media_duration > 0:
+            self.cache.store(cache_key, self.silent_intervals, self.media_duration)
+
+    def __detect_iter(self, silence_level_db, silence_time_threshold, audio_track=0, analysis_channels=None,
+                      analysis_sample_rate=None, analysis_window_time=0.01, workers=1, **kwargs):
+        if self.engine == "numpy":
+            yield from self.__detect_envelope(silence_level_db, silence_time_threshold, audio_track=audio_track,
+                                              analysis_sample_rate=analysis_sample_rate or 16000,
+                                              analysis_window_time=analysis_window_time)
+            return
+
+        if workers != 1:
+            decode_profile = DecodeProfile(
+                audio_track=audio_track,
+                channels=analysis_channels,
+                sample_rate=analysis_sample_rate
+            )
+            yield from self.__detect_chunked(silence_level_db, silence_time_threshold, decode_profile, workers)
+            return
+
+        parser = IntervalParser()
+        self.silent_intervals = parser.get_intervals()
+        self.media_duration = 0.0
+
+        process = subprocess.Popen(
+            self.generate_command(silence_level_db, silence_time_threshold, audio_track=audio_track,
+                                  analysis_channels=analysis_channels, analysis_sample_rate=analysis_sample_rate),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
             text=True
-        ).stderr
+        )
+
+        try:
+            for line in process.stderr:
+                interval = parser.feed_line(line.rstrip("\n"))
+                self.media_duration = parser.media_duration
 
-        self.console_output_array = console_output.split("\n")
+                if interval is not None:
+                    yield interval
+        finally:
+            if process.poll() is None:
+                process.kill()
+            process.stderr.close()
+            process.wait()
 
-        return self.console_output_array
+        if process.returncode != 0:
+            raise Exception(f"FFmpeg exited with code {process.returncode} while detecting silence in {self.filename}.")
+
+    def __detect_chunked(self, silence_level_db, silence_time_threshold, decode_profile, workers):
+        detector = ChunkedDetector(self.filename, workers=workers, decode_profile=decode_profile)
+
+        self.silent_intervals = detector.detect(
+            silence_level_db=silence_level_db,
+            silence_time_threshold=silence_time_threshold
+        )
+        # Matches the precision of the "Duration" line parsed in the serial path
+        self.media_duration = round(detector.media_duration, 2)
+
+        return self.silent_intervals
+
+    def __detect_envelope(self, silence_level_db, silence_time_threshold, audio_track=0,
+                          analysis_sample_rate=16000, analysis_window_time=0.01):
+        from silence_remover.silence_detector.envelope_detector import EnvelopeDetector
+
+        detector = EnvelopeDetector(
+            self.filename,
+            sample_rate=analysis_sample_rate,
+            window_time=analysis_window_time,
+            audio_track=audio_track
+        ).compute_envelope()
+
+        self.silent_intervals = detector.detect_intervals(
+            silence_level_db=silence_level_db,
+            silence_time_threshold=silence_time_threshold
+        )
+        self.media_duration = detector.media_duration
+
+        return self.silent_intervals
+
+    def sweep(self, silence_levels_db, silence_time_thresholds, audio_track=0, analysis_sample_rate=16000,
+              analysis_window_time=0.01, **kwargs):
+        from silence_remover.silence_detector.parameter_sweep import ParameterSweep
+
+        sweep = ParameterSweep(
+            self.filename,
+            audio_track=audio_track,
+            sample_rate=analysis_sample_rate,
+            window_time=analysis_window_time
+        )
+
+        return sweep.run(silence_levels_db, silence_time_thresholds, **kwargs)
+
+    def parse(self, short_interval_threshold=0.3, stretch_time=0.25, split_intervals=-1, segment_count=-1,
+              audible_speed=1.0, silent_speed=6.0, array_backed=False, **kwargs):
+        if array_backed:
+            from silence_remover.silence_detector.interval_array import IntervalArray
+
+            parser = IntervalArray.from_intervals(self.silent_intervals, self.media_duration)
+        else:
+            parser = IntervalParser().load_intervals(self.silent_intervals, self.media_duration)
 
-    def parse(self, short_interval_threshold=0.3, stretch_time=0.25, split_intervals=-1):
-        parser = IntervalParser(self.console_output_array)
         parser_result = (
             parser
-            .parse_console_output()
             .insert_additional_intervals()
             .mark_short_intervals(short_interval_threshold=short_interval_threshold)
             .combine_and_remove_intervals()
             .stretch_audible_intervals(stretch_time=stretch_time)
         )
-        if split_intervals > 0:
+        if segment_count > 0:
+            planner = SegmentPlanner(parser_result.get_intervals(), audible_speed=audible_speed,
+                                     silent_speed=silent_speed)
+            self.detected_intervals = planner.plan(segment_count)
+        elif split_intervals > 0:
             self.detected_intervals = parser_result.split_intervals(split_intervals)
         else:
             self.detected_intervals = parser_result.get_intervals()
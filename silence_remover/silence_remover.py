@@ -1,34 +1,66 @@
+import os
+
 from silence_remover.silence_detector import SilenceDetector
 from silence_remover.filter_generator import FilterGenerator
-from silence_remover.media_editor import MediaEditor
+from silence_remover.media_editor import MediaEditor, SmartCutter
+from silence_remover.media_editor.pipe_io import resolve_input
+from silence_remover.instrumentation import Instrumentation
+from silence_remover.auto_tuner import AutoTuner
 
 
 class SilenceRemover:
-    def __init__(self, input_filename, output_filename, segmented=False, segment_interval_time=-1):
-        self.input_filename = input_filename
+    def __init__(self, input_filename, output_filename, segmented=False, segment_interval_time=-1,
+                 detection_engine="ffmpeg", segment_count=-1, detection_cache=None, stream_format="matroska"):
+        self.input_filename, self.spooled_input_filename = resolve_input(input_filename)
         self.output_filename = output_filename
+        self.stream_format = stream_format
 
-        self.segmented = segmented
+        self.segmented = segmented or segment_count > 0
         self.segment_interval_time = segment_interval_time
+        self.segment_count = segment_count
+
+        self.workers = 1
+        self.threads = None
+        self.custom_flags = ""
 
         self.parsed_result = None
 
-        self.detector = SilenceDetector(self.input_filename)
+        self.instrumentation = Instrumentation()
+        self.detector = SilenceDetector(self.input_filename, engine=detection_engine, cache=detection_cache)
         self.generator = None
-        self.editor = MediaEditor()
+        self.editor = MediaEditor(instrumentation=self.instrumentation)
+
+    def add_hook(self, hook):
+        self.instrumentation.add_hook(hook)
 
     def detect_silence(self, **kwargs):
-        self.detector.detect(**kwargs)
-        self.parsed_result = self.detector.parse(split_intervals=self.segment_interval_time, **kwargs)
+        with self.instrumentation.span("detection"):
+            self.detector.detect(**kwargs)
+
+        return self.retune_silence(**kwargs)
+
+    def retune_silence(self, **kwargs):
+        with self.instrumentation.span("parsing"):
+            self.parsed_result = self.detector.parse(split_intervals=self.segment_interval_time,
+                                                     segment_count=self.segment_count, **kwargs)
+
+        return self.parsed_result
+
+    def __get_flat_intervals(self):
+        # auto_tune can switch to segmented mode before the intervals are parsed again, so the shape is checked
+        if self.parsed_result and isinstance(self.parsed_result[0], list):
+            return [interval for segment in self.parsed_result for interval in segment]
 
         return self.parsed_result
 
     def generate_silence_filter(self, overwrite_prev_config=False, **kwargs):
-        self.generator = FilterGenerator(self.parsed_result, segmented=self.segmented)
-        self.generator.generate(**kwargs)
+        with self.instrumentation.span("filter_generation"):
+            self.generator = FilterGenerator(self.parsed_result, segmented=self.segmented)
+            self.generator.generate(**kwargs)
         print(self.generator.get_filter())
         if not self.editor.configured or overwrite_prev_config:
-            self.editor.set_editor_options(self.generator.get_filter(), self.input_filename, self.output_filename)
+            self.editor.set_editor_options(self.generator.get_filter(), self.input_filename, self.output_filename,
+                                           custom_flags=self.custom_flags, stream_format=self.stream_format)
 
     def export_silence_config(self, config_filename, **kwargs):
         self.generator.generate_editor_file(config_filename, self.input_filename, self.output_filename, **kwargs)
@@ -36,8 +68,60 @@ class SilenceRemover:
     def import_silence_config(self, config_filename):
         self.editor.load_editor_file(config_filename)
 
-    def remove_silence(self, segment=-1):
-        self.editor.edit(segment=segment)
+    def remove_silence(self, segment=-1, workers=None, threads=None, combine_file=None, re_encode=False,
+                       reuse_segments=False):
+        self.editor.edit(segment=segment, workers=workers or self.workers, threads=threads or self.threads,
+                         reuse_segments=reuse_segments)
+
+        if combine_file is not None and self.editor.options["filter"]["segmented"] and segment < 0:
+            self.combine_segments(combine_file, re_encode=re_encode)
+
+    def smart_remove_silence(self, workers=1, min_copy_time=2.0, custom_flags="", **kwargs):
+        intervals = self.__get_flat_intervals()
+
+        cutter = SmartCutter(self.input_filename, self.output_filename, intervals,
+                             min_copy_time=min_copy_time, custom_flags=custom_flags,
+                             instrumentation=self.instrumentation)
+
+        return cutter.render(workers=workers, **kwargs)
+
+    def render_audio(self, sample_rate=None, channels=None, audio_track=0, custom_flags="", **kwargs):
+        from silence_remover.media_editor.audio_renderer import AudioRenderer
+
+        intervals = self.__get_flat_intervals()
+
+        renderer = AudioRenderer(self.input_filename, self.output_filename, intervals, sample_rate=sample_rate,
+                                 channels=channels, audio_track=audio_track, custom_flags=custom_flags)
+
+        with self.instrumentation.span("audio_render"):
+            return renderer.render(**kwargs)
+
+    def auto_tune(self, sample_time=30.0, min_psnr=40.0, use_cache=True, **kwargs):
+        intervals = self.__get_flat_intervals()
+
+        tuner = AutoTuner(self.input_filename, intervals, sample_time=sample_time, min_psnr=min_psnr)
+
+        with self.instrumentation.span("auto_tune"):
+            profile = tuner.tune(use_cache=use_cache, **kwargs)
+
+        # The segment count only takes effect once the intervals are parsed again with retune_silence
+        self.segment_count = profile["segment_count"]
+        self.segmented = self.segmented or self.segment_count > 0
+
+        self.workers = profile["segment_count"]
+        self.threads = profile["threads"]
+        self.custom_flags = profile["custom_flags"]
+        if self.editor.configured:
+            self.editor.options["custom_flags"] = self.custom_flags
+
+        return profile
 
     def combine_segments(self, output_file, re_encode=False):
-        self.editor.combine(self.output_filename, output_file, re_encode=re_encode)
+        with self.instrumentation.span("combine"):
+            self.editor.combine(self.output_filename, output_file, re_encode=re_encode,
+                                stream_format=self.stream_format)
+
+    def close(self):
+        if self.spooled_input_filename is not None:
+            os.remove(self.spooled_input_filename)
+            self.spooled_input_filename = None
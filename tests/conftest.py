@@ -0,0 +1,10 @@
+def generate_intervals(block_count, audible_time=10.0, silent_time=1.0):
+    intervals = []
+    time = 0.0
+
+    for _ in range(block_count):
+        for silent, duration in ((False, audible_time), (True, silent_time)):
+            intervals.append({"start": time, "end": time + duration, "silent": silent, "duration": duration})
+            time += duration
+
+    return intervals
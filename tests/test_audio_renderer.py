@@ -0,0 +1,158 @@
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from conftest import generate_intervals  # noqa: E402
+from silence_remover.filter_generator import FilterGenerator  # noqa: E402
+from silence_remover.media_editor import MediaEditor  # noqa: E402
+from silence_remover.media_editor.audio_renderer import AudioRenderer  # noqa: E402
+
+SAMPLE_RATE = 16000
+
+requires_ffmpeg = pytest.mark.skipif(shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None,
+                                     reason="FFmpeg is not installed")
+
+
+def generate_sine(duration, frequency=440.0, amplitude=0.5, channels=1, sample_rate=SAMPLE_RATE):
+    time = np.arange(int(duration * sample_rate)) / sample_rate
+    samples = (amplitude * np.sin(2 * np.pi * frequency * time)).astype(np.float32)
+
+    return np.repeat(samples[:, np.newaxis], channels, axis=1)
+
+
+def create_renderer(samples, intervals=(), sample_rate=SAMPLE_RATE):
+    renderer = AudioRenderer("input.wav", "output.wav", list(intervals), sample_rate=sample_rate,
+                             channels=samples.shape[1])
+    renderer.samples = samples
+
+    return renderer
+
+
+def get_rms(samples):
+    return float(np.sqrt(np.mean(np.square(samples, dtype=np.float64))))
+
+
+@pytest.mark.parametrize("speed", [0.5, 0.8, 1.5, 2.0, 4.0, 6.0, 8.0])
+@pytest.mark.parametrize("duration", [0.01, 0.05, 0.5, 2.0])
+def test_time_stretch_length(speed, duration):
+    samples = generate_sine(duration, channels=2)
+    renderer = create_renderer(samples)
+
+    stretched = renderer.time_stretch(samples, speed)
+
+    assert len(stretched) == int(len(samples) / speed)
+    assert stretched.shape[1] == 2
+
+
+@pytest.mark.parametrize("speed", [2.0, 4.0, 6.0])
+def test_time_stretch_keeps_level_and_pitch(speed):
+    samples = generate_sine(4.0)
+    renderer = create_renderer(samples)
+
+    stretched = renderer.time_stretch(samples, speed)[:, 0]
+    spectrum = np.abs(np.fft.rfft(stretched))
+    frequency = np.argmax(spectrum) * SAMPLE_RATE / len(stretched)
+
+    assert frequency == pytest.approx(440.0, abs=5.0)
+    assert get_rms(stretched) == pytest.approx(get_rms(samples), rel=0.05)
+
+
+def test_pieces_match_filter_graph_lengths_and_volume():
+    intervals = generate_intervals(5, audible_time=1.0, silent_time=0.7)
+    samples = generate_sine(intervals[-1]["end"])
+    renderer = create_renderer(samples, intervals)
+
+    pieces = list(renderer.generate_pieces(audible_speed=1.0, silent_speed=6.0, audible_volume=1.0,
+                                           silent_volume=0.5))
+
+    assert len(pieces) == len(intervals)
+    for piece, interval in zip(pieces, intervals):
+        # atrim followed by atempo produces duration / speed worth of samples
+        sample_count = int(round(interval["end"] * SAMPLE_RATE)) - int(round(interval["start"] * SAMPLE_RATE))
+        speed = 6.0 if interval["silent"] else 1.0
+        assert len(piece) == int(sample_count / speed)
+
+        fade_length = renderer.get_fade_length()
+        expected_rms = get_rms(samples) * (0.5 if interval["silent"] else 1.0)
+        assert get_rms(piece[fade_length:-fade_length]) == pytest.approx(expected_rms, rel=0.05)
+
+
+def test_contiguous_pieces_crossfade_into_the_source():
+    intervals = generate_intervals(5, audible_time=1.0, silent_time=0.7)
+    samples = generate_sine(intervals[-1]["end"], channels=2)
+    renderer = create_renderer(samples, intervals)
+
+    output = np.concatenate(list(renderer.generate_pieces(silent_speed=1.0, silent_volume=1.0)))
+
+    # Every lead-in is the audio just before the cut, so crossfading unchanged pieces gives back the source
+    assert output.shape == samples.shape
+    assert np.allclose(output, samples, atol=1e-5)
+
+
+def test_custom_flags_accept_lists():
+    renderer = create_renderer(generate_sine(0.1))
+    renderer.custom_flags = ["-c:a", "flac"]
+
+    assert renderer.generate_encode_command()[-4:] == ["-c:a", "flac", "-y", "output.wav"]
+
+
+def test_zero_speed_drops_intervals():
+    intervals = generate_intervals(3, audible_time=1.0, silent_time=0.7)
+    renderer = create_renderer(generate_sine(intervals[-1]["end"]), intervals)
+
+    pieces = list(renderer.generate_pieces(silent_speed=0))
+
+    assert len(pieces) == 3
+    assert sum(len(piece) for piece in pieces) == pytest.approx(3 * SAMPLE_RATE, abs=3)
+
+
+def run_ffmpeg(*arguments):
+    subprocess.run(["ffmpeg", "-v", "error", *arguments], check=True)
+
+
+def decode(filename):
+    output = subprocess.run(["ffmpeg", "-v", "error", "-i", filename, "-f", "f32le", "pipe:"],
+                            capture_output=True, check=True).stdout
+
+    return np.frombuffer(output, dtype="<f4")
+
+
+def probe_audio(filename):
+    output = subprocess.run(["ffprobe", "-v", "error", "-select_streams", "a:0",
+                             "-show_entries", "stream=sample_rate,channels", "-of", "json", filename],
+                            capture_output=True, text=True, check=True).stdout
+
+    return json.loads(output)["streams"][0]
+
+
+@requires_ffmpeg
+def test_render_matches_filter_graph(tmp_path):
+    input_filename = os.path.join(tmp_path, "input.wav")
+    run_ffmpeg("-f", "lavfi", "-i", "sine=frequency=440:sample_rate=44100:duration=8.5", "-ac", "1",
+               input_filename)
+
+    intervals = generate_intervals(5, audible_time=1.0, silent_time=0.7)
+    renderer_filename = os.path.join(tmp_path, "renderer.wav")
+    graph_filename = os.path.join(tmp_path, "graph.wav")
+
+    AudioRenderer(input_filename, renderer_filename, intervals).render()
+
+    generator = FilterGenerator(intervals)
+    generator.generate(audio_only=True)
+    editor = MediaEditor()
+    editor.set_editor_options(generator.get_filter(), input_filename, graph_filename)
+    editor.edit()
+
+    assert probe_audio(renderer_filename) == probe_audio(input_filename)
+
+    renderer_samples, graph_samples = decode(renderer_filename), decode(graph_filename)
+    assert len(renderer_samples) == pytest.approx(len(graph_samples), abs=0.01 * 44100)
+
+    renderer_level = 20 * np.log10(get_rms(renderer_samples))
+    graph_level = 20 * np.log10(get_rms(graph_samples))
+    assert renderer_level == pytest.approx(graph_level, abs=0.5)
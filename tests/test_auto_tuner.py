@@ -0,0 +1,45 @@
+import json
+import os
+
+import pytest
+
+from silence_remover.auto_tuner import AutoTuner
+
+RESULTS = [
+    {"segment_count": 1, "threads": None, "custom_flags": [], "throughput": 1.0, "psnr": None,
+     "quality_check": "reference"},
+    {"segment_count": 2, "threads": None, "custom_flags": [], "throughput": 2.0, "psnr": 45.0,
+     "quality_check": "psnr"},
+    {"segment_count": 4, "threads": None, "custom_flags": [], "throughput": 3.0, "psnr": None,
+     "quality_check": "psnr"},
+    {"segment_count": 4, "threads": 1, "custom_flags": ["-preset", "ultrafast"], "throughput": 4.0, "psnr": 35.0,
+     "quality_check": "psnr"}
+]
+
+
+def create_tuner(tmp_path, monkeypatch, min_psnr):
+    tuner = AutoTuner("input.mp4", [], min_psnr=min_psnr, cache_filename=os.path.join(tmp_path, "autotune.json"))
+    monkeypatch.setattr(tuner, "get_cache_key", lambda filter_options: "key")
+
+    return tuner
+
+
+@pytest.mark.parametrize("min_psnr, segment_count", [(30.0, 4), (40.0, 2), (50.0, 1)])
+def test_cached_results_are_filtered_with_the_current_min_psnr(tmp_path, monkeypatch, min_psnr, segment_count):
+    tuner = create_tuner(tmp_path, monkeypatch, min_psnr)
+    with open(tuner.cache_filename, "w") as f:
+        f.write(json.dumps({"key": {"results": RESULTS, "created": 0}}))
+
+    assert tuner.tune()["segment_count"] == segment_count
+
+
+def test_unmeasured_psnr_is_rejected(tmp_path, monkeypatch):
+    tuner = create_tuner(tmp_path, monkeypatch, 40.0)
+
+    assert [tuner.is_accepted(result) for result in RESULTS] == [True, True, False, False]
+
+
+def test_audio_only_runs_skip_the_quality_check(tmp_path, monkeypatch):
+    tuner = create_tuner(tmp_path, monkeypatch, 40.0)
+
+    assert tuner.is_accepted({**RESULTS[2], "quality_check": "audio_only"})
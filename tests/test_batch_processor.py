@@ -0,0 +1,78 @@
+import os
+import threading
+
+from conftest import generate_intervals
+from silence_remover import batch_processor
+from silence_remover.batch_processor import BatchProcessor
+
+
+class FakeDetector:
+    def __init__(self, filename, engine="ffmpeg"):
+        self.filename = filename
+
+    def detect(self, **kwargs):
+        pass
+
+    def parse(self, segment_count=-1, **kwargs):
+        intervals = generate_intervals(segment_count, audible_time=5.0, silent_time=1.0)
+        return [intervals[2 * i:2 * i + 2] for i in range(segment_count)]
+
+
+class FakeProcess:
+    started = []
+    killed_names = []
+
+    def __init__(self, command, **kwargs):
+        self.output_filename = command[-1]
+        self.returncode = None
+        self.killed = threading.Event()
+        FakeProcess.started.append(os.path.basename(self.output_filename))
+
+    def communicate(self):
+        with open(self.output_filename, "w+") as f:
+            f.write("output")
+
+        # The first segment of the broken input fails, the next one keeps running until it is killed
+        if self.output_filename.endswith("broken_0.mp4"):
+            self.returncode = 1
+        elif "broken" in self.output_filename:
+            self.returncode = -9 if self.killed.wait(timeout=10) else 0
+        else:
+            self.returncode = 0
+
+        return "", ""
+
+    def kill(self):
+        FakeProcess.killed_names.append(os.path.basename(self.output_filename))
+        self.killed.set()
+
+
+def create_inputs(tmp_path):
+    filenames = []
+    for name in ("broken.mp4", "working.mp4"):
+        filename = os.path.join(tmp_path, name)
+        with open(filename, "w+") as f:
+            f.write("input")
+        filenames.append(filename)
+
+    return filenames
+
+
+def test_failed_file_cancels_and_removes_its_segments(tmp_path, monkeypatch):
+    monkeypatch.setattr(batch_processor, "SilenceDetector", FakeDetector)
+    monkeypatch.setattr(batch_processor.subprocess, "Popen", FakeProcess)
+    FakeProcess.started = []
+    FakeProcess.killed_names = []
+
+    output_directory = os.path.join(tmp_path, "output")
+    processor = BatchProcessor(create_inputs(tmp_path), output_directory, workers=2, segment_count=8)
+    manifest = processor.run()
+
+    statuses = {os.path.basename(filename): state["status"] for filename, state in manifest["files"].items()}
+    assert statuses == {"broken.mp4": "failed", "working.mp4": "done"}
+
+    # Segments running next to the failed one were killed and the queued ones were cancelled
+    started_segments = [name for name in FakeProcess.started if "broken" in name]
+    assert len(started_segments) < 8
+    assert sorted(FakeProcess.killed_names) == sorted(started_segments[1:])
+    assert not os.path.exists(processor.segment_directory)
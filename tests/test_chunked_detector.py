@@ -0,0 +1,84 @@
+import random
+
+import pytest
+
+from silence_remover.silence_detector import ChunkedDetector
+
+TIME_STEP = 0.01
+
+
+def generate_mask(rng, step_count):
+    mask = []
+    while len(mask) < step_count:
+        silent = rng.random() < 0.5
+        mask.extend([silent] * rng.randint(1, 150))
+
+    return mask[:step_count]
+
+
+def simulate_silencedetect(mask, start, duration, silence_time_threshold):
+    # Mimics silencedetect on a seeked range, runs that are still open at the end of the range are closed there
+    first_index = int(round(start / TIME_STEP))
+    last_index = int(round((start + duration) / TIME_STEP))
+
+    intervals = []
+    run_start = None
+    for i in range(first_index, last_index + 1):
+        silent = i < last_index and mask[i]
+
+        if silent and run_start is None:
+            run_start = i
+        elif not silent and run_start is not None:
+            if (i - run_start) * TIME_STEP >= silence_time_threshold - 1e-9:
+                intervals.append({
+                    "start": run_start * TIME_STEP,
+                    "silent": True,
+                    "end": i * TIME_STEP,
+                    "duration": (i - run_start) * TIME_STEP
+                })
+            run_start = None
+
+    return intervals
+
+
+def detect_chunked(mask, workers, silence_time_threshold, monkeypatch):
+    media_duration = len(mask) * TIME_STEP
+    detector = ChunkedDetector("input.mp4", workers=workers, min_chunk_time=media_duration / workers)
+
+    def probe_duration():
+        detector.media_duration = media_duration
+        return media_duration
+
+    def detect_range(start, duration, silence_level_db, threshold):
+        return simulate_silencedetect(mask, start, duration, threshold)
+
+    monkeypatch.setattr(detector, "probe_duration", probe_duration)
+    monkeypatch.setattr(detector, "detect_range", detect_range)
+
+    return detector.detect(silence_time_threshold=silence_time_threshold)
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_chunked_detection_matches_serial_detection(seed, monkeypatch):
+    rng = random.Random(seed)
+    workers = rng.choice([2, 3, 4, 8])
+    silence_time_threshold = rng.choice([0.1, 0.3, 0.5, 1.0])
+    mask = generate_mask(rng, workers * rng.randint(200, 800))
+
+    serial_intervals = simulate_silencedetect(mask, 0, len(mask) * TIME_STEP, silence_time_threshold)
+    chunked_intervals = detect_chunked(mask, workers, silence_time_threshold, monkeypatch)
+
+    assert len(chunked_intervals) == len(serial_intervals)
+    for chunked, serial in zip(chunked_intervals, serial_intervals):
+        assert chunked["start"] == pytest.approx(serial["start"], abs=1e-6)
+        assert chunked["end"] == pytest.approx(serial["end"], abs=1e-6)
+
+
+def test_silence_spanning_a_whole_chunk_is_merged(monkeypatch):
+    mask = [False] * 100 + [True] * 500 + [False] * 200
+
+    chunked_intervals = detect_chunked(mask, 4, 0.5, monkeypatch)
+
+    assert len(chunked_intervals) == 1
+    assert chunked_intervals[0]["start"] == pytest.approx(1.0)
+    assert chunked_intervals[0]["end"] == pytest.approx(6.0)
@@ -0,0 +1,30 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from silence_remover.silence_detector.detection_cache import DetectionCache
+
+INTERVALS = [{"start": 1.0, "end": 2.0, "silent": True, "duration": 1.0}]
+
+
+def test_threads_can_store_the_same_key(tmp_path):
+    cache = DetectionCache(cache_dir=str(tmp_path))
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [executor.submit(cache.store, "key", INTERVALS, float(i)) for i in range(200)]
+        for future in futures:
+            future.result()
+
+    assert cache.load("key")["silent_intervals"] == INTERVALS
+    assert os.listdir(tmp_path) == ["key.json"]
+
+
+def test_eviction_skips_entries_removed_by_other_processes(tmp_path, monkeypatch):
+    cache = DetectionCache(cache_dir=str(tmp_path), max_size=0)
+    listdir = os.listdir
+
+    # Another process evicts an entry between listing the directory and reading its size
+    monkeypatch.setattr(os, "listdir", lambda path: listdir(path) + ["removed.json"])
+
+    cache.store("key", INTERVALS, 3.0)
+
+    assert listdir(tmp_path) == []
@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from silence_remover.silence_detector.envelope_detector import EnvelopeDetector  # noqa: E402
+
+SAMPLE_RATE = 16000
+WINDOW_TIME = 0.01
+
+
+def generate_signal(rng, channels, silence_level_db, silence_time_threshold):
+    # Parts are kept well away from the threshold time, so window quantization cannot change the result
+    noise_level = 10 ** (silence_level_db / 20)
+    parts = []
+
+    for _ in range(rng.randint(5, 20)):
+        silent = rng.random() < 0.5
+        if rng.random() < 0.5:
+            duration = silence_time_threshold + rng.uniform(0.05, 1.0)
+        else:
+            duration = rng.uniform(0.02, silence_time_threshold - 0.05)
+
+        sample_count = int(round(duration / WINDOW_TIME)) * int(SAMPLE_RATE * WINDOW_TIME)
+        amplitude = noise_level * (0.5 if silent else 4.0)
+
+        # Quiet speech, most samples sit far below the peak which alone crosses the noise level
+        part = rng.choice([-1, 1]) * np.full((sample_count, channels), amplitude * 0.05, dtype=np.float32)
+        if not silent:
+            part[::97, rng.randrange(channels)] = amplitude
+
+        parts.append((silent, part))
+
+    return parts
+
+
+def detect_reference(parts, silence_time_threshold):
+    intervals = []
+    time = 0.0
+    run_start = None
+
+    for silent, part in parts + [(False, np.zeros((0, 1)))]:
+        if silent and run_start is None:
+            run_start = time
+        elif not silent and run_start is not None:
+            if time - run_start >= silence_time_threshold:
+                intervals.append((run_start, time))
+            run_start = None
+
+        time += len(part) / SAMPLE_RATE
+
+    return intervals
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_matches_per_sample_thresholding(seed):
+    rng = random.Random(seed)
+    channels = rng.choice([1, 2])
+    silence_level_db = rng.choice([-50, -35, -20])
+    silence_time_threshold = rng.choice([0.3, 0.5])
+
+    parts = generate_signal(rng, channels, silence_level_db, silence_time_threshold)
+    signal = np.concatenate([part for _, part in parts])
+
+    detector = EnvelopeDetector("input.wav", sample_rate=SAMPLE_RATE, window_time=WINDOW_TIME)
+    window_size = int(SAMPLE_RATE * WINDOW_TIME) * channels
+    detector.levels = EnvelopeDetector.window_levels(signal.reshape(-1, window_size))
+    detector.media_duration = len(signal) / SAMPLE_RATE
+
+    intervals = detector.detect_intervals(silence_level_db=silence_level_db,
+                                          silence_time_threshold=silence_time_threshold)
+    reference = detect_reference(parts, silence_time_threshold)
+
+    assert [(interval["start"], interval["end"]) for interval in intervals] == \
+        [pytest.approx(interval, abs=1e-6) for interval in reference]
+
+
+def test_quiet_speech_is_not_silent():
+    window = np.full((1, 160), 0.001, dtype=np.float32)
+    window[0, 80] = 0.05
+
+    assert EnvelopeDetector.window_levels(window)[0] > -35
@@ -0,0 +1,128 @@
+import bisect
+import random
+import re
+
+import pytest
+
+from silence_remover.filter_generator import FilterGenerator
+
+FRAME_TIME = 256 / 48000
+
+
+def generate_grouped_filter(intervals, **kwargs):
+    generator = FilterGenerator(intervals)
+    generator.generate(graph_strategy="grouped", **kwargs)
+
+    video_line, audio_line = generator.get_filter()["filter_lines"]
+
+    return video_line, audio_line
+
+
+def generate_intervals(rng, interval_count):
+    intervals = []
+    time = 0.0
+
+    for i in range(interval_count):
+        duration = rng.uniform(0.05, 2.0)
+        intervals.append({"start": time, "end": time + duration, "silent": i % 2 == 1, "duration": duration})
+        time += duration
+
+    return intervals
+
+
+def parse_video_groups(video_line):
+    return [
+        (float(start), float(end), float(offset), float(factor))
+        for start, end, offset, factor in re.findall(
+            r"gte\(T,([0-9.]+)\)\*lt\(T,([0-9.]+)\)\*\(([0-9.e-]+)\+\(T-[0-9.]+\)\*([0-9.]+)\)", video_line
+        )
+    ]
+
+
+def parse_audio_groups(audio_line):
+    return [(int(first), int(last)) for first, last in re.findall(r"gte\(n,([0-9]+)\)\*lt\(n,([0-9]+)\)", audio_line)]
+
+
+def parse_tempo_commands(audio_line):
+    initial_tempo = float(re.search(r",atempo=([0-9.]+)\[", audio_line)[1])
+    commands = [(float(time), float(tempo)) for time, tempo in
+                re.findall(r"([0-9.]+) atempo tempo ([0-9.]+)", audio_line)]
+
+    return initial_tempo, commands
+
+
+def test_grouped_filter_strings():
+    intervals = [
+        {"start": 0.0, "end": 1.0, "silent": False, "duration": 1.0},
+        {"start": 1.0, "end": 1.5, "silent": True, "duration": 0.5},
+        {"start": 1.5, "end": 3.0, "silent": False, "duration": 1.5}
+    ]
+
+    video_line, audio_line = generate_grouped_filter(intervals)
+
+    assert video_line == (
+        "[0:v]select='gte(t,0.0)*lt(t,1.002667)+gte(t,1.002667)*lt(t,1.498667)+gte(t,1.498667)*lt(t,2.997333)',"
+        "setpts='(gte(T,0.0)*lt(T,1.002667)*(0.0+(T-0.0)*1.0)"
+        "+gte(T,1.002667)*lt(T,1.498667)*(1.002667+(T-1.002667)*0.1667)"
+        "+gte(T,1.498667)*lt(T,2.997333)*(1.085333+(T-1.498667)*1.0))/TB'[vout]"
+    )
+    assert audio_line == (
+        "[0:a]aresample=48000,asetnsamples=n=256:p=0,"
+        "aselect='gte(n,0)*lt(n,188)+gte(n,188)*lt(n,281)+gte(n,281)*lt(n,562)',"
+        "volume='gte(t,-0.002667)*lt(t,1.0)*1.0+gte(t,1.0)*lt(t,1.496)*0.5"
+        "+gte(t,1.496)*lt(t,2.994666)*1.0':eval=frame,"
+        "asetpts=N/SR/TB,asendcmd=c='1.0 atempo tempo 6.0;1.496 atempo tempo 1.0',atempo=1.0[aout]"
+    )
+
+
+def test_grouped_filter_merges_equal_neighbours():
+    intervals = [
+        {"start": 0.0, "end": 1.0, "silent": False, "duration": 1.0},
+        {"start": 1.0, "end": 2.0, "silent": True, "duration": 1.0}
+    ]
+
+    video_line, audio_line = generate_grouped_filter(intervals, silent_speed=1.0, silent_volume=1.0)
+
+    assert parse_audio_groups(audio_line) == [(0, 375)]
+    assert "volume" not in audio_line
+    assert "atempo" not in audio_line
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("silent_speed, silent_volume", [(6.0, 0.5), (2.5, 1.0), (1.0, 0.2)])
+def test_grouped_audio_stays_in_sync_with_video(seed, silent_speed, silent_volume):
+    rng = random.Random(seed)
+    intervals = generate_intervals(rng, 5000)
+
+    video_line, audio_line = generate_grouped_filter(intervals, silent_speed=silent_speed,
+                                                     silent_volume=silent_volume)
+    video_groups = parse_video_groups(video_line)
+    audio_groups = parse_audio_groups(audio_line)
+
+    assert len(video_groups) == len(audio_groups)
+
+    if silent_speed != 1.0:
+        initial_tempo, commands = parse_tempo_commands(audio_line)
+        command_times = [time for time, _ in commands]
+
+    audio_time = 0.0
+    selected_frames = 0
+    for (start, end, offset, factor), (first_frame, last_frame) in zip(video_groups, audio_groups):
+        # Both streams cut the same audio frames
+        assert start == pytest.approx(first_frame * FRAME_TIME, abs=1e-6)
+        assert end == pytest.approx(last_frame * FRAME_TIME, abs=1e-6)
+        assert offset == pytest.approx(audio_time, abs=1e-5)
+
+        speed = 1.0
+        if silent_speed != 1.0:
+            # No tempo switch may fall inside a group
+            first_index = bisect.bisect_right(command_times, selected_frames * FRAME_TIME)
+            last_frame_time = (selected_frames + last_frame - first_frame - 1) * FRAME_TIME
+            last_index = bisect.bisect_right(command_times, last_frame_time)
+            assert first_index == last_index
+            speed = commands[first_index - 1][1] if first_index > 0 else initial_tempo
+
+        assert 1 / speed == pytest.approx(factor, abs=1e-4)
+
+        audio_time += (last_frame - first_frame) * FRAME_TIME / speed
+        selected_frames += last_frame - first_frame
@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from silence_remover.silence_detector.interval_array import IntervalArray  # noqa: E402
+from silence_remover.silence_detector.interval_parser import IntervalParser  # noqa: E402
+
+
+def generate_silent_intervals(rng):
+    media_duration = round(rng.uniform(1.0, 300.0), 3)
+    intervals = []
+    time = rng.choice([0.0, round(rng.uniform(0.0, 5.0), 3)])
+
+    while True:
+        start = time if not intervals and time == 0.0 else round(time + rng.uniform(0.01, 20.0), 3)
+        end = round(start + rng.uniform(0.01, 15.0), 3)
+        if end >= media_duration:
+            if rng.random() < 0.5 and start < media_duration:
+                intervals.append({"start": start, "end": media_duration, "silent": True,
+                                  "duration": media_duration - start})
+            break
+
+        intervals.append({"start": start, "end": end, "silent": True, "duration": end - start})
+        time = end
+
+    return intervals, media_duration
+
+
+def process(parser, short_interval_threshold, stretch_time):
+    return (
+        parser
+        .insert_additional_intervals()
+        .mark_short_intervals(short_interval_threshold=short_interval_threshold)
+        .combine_and_remove_intervals()
+        .stretch_audible_intervals(stretch_time=stretch_time)
+    )
+
+
+def assert_same_intervals(array_intervals, parser_intervals):
+    assert len(array_intervals) == len(parser_intervals)
+    for array_interval, parser_interval in zip(array_intervals, parser_intervals):
+        assert array_interval["silent"] == parser_interval["silent"]
+        assert array_interval["start"] == pytest.approx(parser_interval["start"], abs=1e-9)
+        assert array_interval["end"] == pytest.approx(parser_interval["end"], abs=1e-9)
+        assert array_interval["duration"] == pytest.approx(parser_interval["duration"], abs=1e-9)
+
+
+def create_parsers(rng):
+    silent_intervals, media_duration = generate_silent_intervals(rng)
+
+    return (
+        IntervalArray.from_intervals(silent_intervals, media_duration),
+        IntervalParser().load_intervals(silent_intervals, media_duration)
+    )
+
+
+@pytest.mark.parametrize("seed", range(300))
+def test_processing_matches_interval_parser(seed):
+    rng = random.Random(seed)
+    array, parser = create_parsers(rng)
+    short_interval_threshold = rng.choice([0.1, 0.3, 1.0])
+    stretch_time = rng.choice([0.0, 0.1, short_interval_threshold])
+
+    array_intervals = process(array, short_interval_threshold, stretch_time).get_intervals()
+    parser_intervals = process(parser, short_interval_threshold, stretch_time).get_intervals()
+
+    assert_same_intervals(array_intervals, parser_intervals)
+
+
+@pytest.mark.parametrize("seed", range(300))
+def test_split_intervals_matches_interval_parser(seed):
+    rng = random.Random(seed)
+    array, parser = create_parsers(rng)
+    max_interval_time = rng.choice([1.0, 5.0, 10.0, 60.0])
+
+    array_segments = process(array, 0.3, 0.25).split_intervals(max_interval_time)
+    parser_segments = process(parser, 0.3, 0.25).split_intervals(max_interval_time)
+
+    assert len(array_segments) == len(parser_segments)
+    for array_segment, parser_segment in zip(array_segments, parser_segments):
+        assert_same_intervals(array_segment, parser_segment)
@@ -0,0 +1,106 @@
+import random
+
+import pytest
+
+from silence_remover.live_silence_remover import LiveSilenceRemover
+from silence_remover.silence_detector import IntervalParser
+
+PARSE_OPTIONS = {"short_interval_threshold": 0.3, "stretch_time": 0.25}
+SILENCE_TIME_THRESHOLD = 0.5
+
+
+def generate_silences(rng, media_duration, max_silence_time):
+    silences = []
+    time = rng.uniform(0.5, 5.0)
+
+    while True:
+        start = time + rng.uniform(0.5, 20.0)
+        end = start + rng.uniform(SILENCE_TIME_THRESHOLD, max_silence_time)
+        if end >= media_duration - 1.0:
+            return silences
+
+        silences.append({"start": start, "end": end, "silent": True, "duration": end - start})
+        time = end
+
+
+def detect_pending(silences, finalized_time, scanned_time, final):
+    # Mimics silencedetect on a scan seeked to the finalized time
+    pending = []
+    for silence in silences:
+        start = max(silence["start"], finalized_time)
+        end = min(silence["end"], scanned_time)
+        closed = silence["end"] < scanned_time or final
+
+        if closed and end - start >= SILENCE_TIME_THRESHOLD:
+            pending.append({"start": start, "end": end, "silent": True, "duration": end - start})
+
+    return pending
+
+
+def merge(intervals):
+    merged = []
+    for interval in intervals:
+        if merged and merged[-1]["silent"] == interval["silent"]:
+            merged[-1]["end"] = interval["end"]
+        else:
+            merged.append({"start": interval["start"], "end": interval["end"], "silent": interval["silent"]})
+
+    return merged
+
+
+def run_live(silences, media_duration, poll_time, **kwargs):
+    remover = LiveSilenceRemover("input.mkv", "output.mkv", **kwargs)
+    spans = []
+
+    scanned_time = 0.0
+    while True:
+        scanned_time = min(media_duration, scanned_time + poll_time)
+        final = scanned_time == media_duration
+
+        remover.pending_intervals = detect_pending(silences, remover.finalized_time, scanned_time, final)
+        remover.scanned_time = scanned_time
+
+        commit_time = remover.find_commit_time(final)
+        if commit_time - remover.finalized_time > remover.tolerance:
+            intervals, remover.finalized_time = remover.get_span_intervals(commit_time, PARSE_OPTIONS, final=final)
+            spans.append(intervals)
+
+        if final:
+            return spans
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_spans_match_offline_processing(seed):
+    rng = random.Random(seed)
+    media_duration = rng.uniform(200.0, 900.0)
+    silences = generate_silences(rng, media_duration, max_silence_time=8.0)
+
+    spans = run_live(silences, media_duration, poll_time=2.0, commit_horizon=10.0, min_segment_time=30.0,
+                     max_segment_time=60.0)
+    reference = (
+        IntervalParser()
+        .load_intervals(silences, media_duration)
+        .insert_additional_intervals()
+        .mark_short_intervals(short_interval_threshold=PARSE_OPTIONS["short_interval_threshold"])
+        .combine_and_remove_intervals()
+        .stretch_audible_intervals(stretch_time=PARSE_OPTIONS["stretch_time"])
+        .get_intervals()
+    )
+
+    assert len(spans) > 1
+    for previous, current in zip(spans, spans[1:]):
+        assert previous[-1]["end"] == pytest.approx(current[0]["start"])
+
+    merged = merge([interval for span in spans for interval in span])
+    assert len(merged) == len(reference)
+    for interval, reference_interval in zip(merged, reference):
+        assert interval["silent"] == reference_interval["silent"]
+        assert interval["start"] == pytest.approx(reference_interval["start"], abs=1e-6)
+        assert interval["end"] == pytest.approx(reference_interval["end"], abs=1e-6)
+
+
+def test_recordings_without_silence_are_committed_while_growing():
+    spans = run_live([], 600.0, poll_time=2.0, commit_horizon=10.0, min_segment_time=30.0, max_segment_time=60.0)
+
+    assert len(spans) >= 8
+    assert max(span[-1]["end"] - span[0]["start"] for span in spans) <= 62.0
@@ -0,0 +1,94 @@
+import json
+import os
+
+import pytest
+
+from silence_remover.filter_generator import FilterGenerator
+from silence_remover.media_editor import MediaEditor
+from silence_remover.media_editor import media_editor
+
+
+class FakeScheduler:
+    rendered = []
+    killed = False
+
+    def __init__(self, max_workers=1, instrumentation=None):
+        self.results = {}
+
+    def run(self, jobs, on_success=None):
+        for key, command, temp_files in jobs:
+            FakeScheduler.rendered.append(key)
+
+            # FFmpeg truncates the output as soon as it starts
+            with open(command[-1], "w+") as f:
+                f.write("partial" if FakeScheduler.killed else "complete")
+
+            if FakeScheduler.killed:
+                raise Exception(f"FFmpeg was killed while rendering {key}.")
+
+            self.results[key] = {"returncode": 0, "console_output": []}
+            if on_success is not None:
+                on_success(key)
+
+
+@pytest.fixture
+def editor(tmp_path, monkeypatch):
+    monkeypatch.setattr(media_editor, "RenderScheduler", FakeScheduler)
+    FakeScheduler.rendered = []
+    FakeScheduler.killed = False
+
+    input_filename = os.path.join(tmp_path, "input.mp4")
+    with open(input_filename, "w+") as f:
+        f.write("input")
+
+    intervals = [
+        [{"start": 0.0, "end": 5.0, "silent": False}, {"start": 5.0, "end": 6.0, "silent": True}],
+        [{"start": 6.0, "end": 9.0, "silent": False}]
+    ]
+    generator = FilterGenerator(intervals, segmented=True)
+    generator.generate()
+
+    editor = MediaEditor()
+    editor.set_editor_options(generator.get_filter(), input_filename, os.path.join(tmp_path, "output{segment}.mp4"))
+
+    return editor
+
+
+def render(editor, custom_flags="", killed=False, reuse_segments=True):
+    editor.options["custom_flags"] = custom_flags
+    FakeScheduler.rendered = []
+    FakeScheduler.killed = killed
+
+    editor.edit(workers=2, reuse_segments=reuse_segments)
+
+
+def test_unchanged_segments_are_reused(editor):
+    render(editor)
+    render(editor)
+
+    assert FakeScheduler.rendered == []
+
+
+def test_killed_render_is_not_reused(editor):
+    render(editor)
+
+    with pytest.raises(Exception):
+        render(editor, custom_flags="-crf 30", killed=True)
+
+    render(editor)
+
+    assert FakeScheduler.rendered == ["segment 0", "segment 1"]
+
+
+def test_manifest_is_only_written_when_reusing(editor):
+    render(editor, reuse_segments=False)
+
+    assert not os.path.exists(editor.get_manifest_filename())
+
+    render(editor)
+    with open(editor.get_manifest_filename(), "r") as f:
+        assert set(json.loads(f.read())) == {"0", "1"}
+
+    render(editor, reuse_segments=False)
+
+    assert not os.path.exists(editor.get_manifest_filename())
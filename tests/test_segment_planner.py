@@ -0,0 +1,45 @@
+import pytest
+
+from conftest import generate_intervals
+from silence_remover.silence_detector import SegmentPlanner
+
+
+@pytest.mark.parametrize("segment_count", [1, 2, 3, 4, 5, 8, 10])
+def test_plan_returns_requested_segment_count(segment_count):
+    intervals = generate_intervals(10)
+
+    segments = SegmentPlanner(intervals).plan(segment_count)
+
+    assert len(segments) == segment_count
+
+
+@pytest.mark.parametrize("segment_count", [2, 4, 8])
+def test_plan_covers_intervals_without_gaps(segment_count):
+    intervals = generate_intervals(10)
+
+    segments = SegmentPlanner(intervals).plan(segment_count)
+    flattened = [interval for segment in segments for interval in segment]
+
+    assert flattened[0]["start"] == intervals[0]["start"]
+    assert flattened[-1]["end"] == intervals[-1]["end"]
+    for previous, current in zip(flattened, flattened[1:]):
+        assert previous["end"] == pytest.approx(current["start"])
+
+
+def test_plan_balances_cost():
+    intervals = generate_intervals(10)
+
+    planner = SegmentPlanner(intervals)
+    planner.plan(2)
+    costs = [estimate["cost"] for estimate in planner.segment_estimates]
+
+    assert max(costs) / min(costs) < 1.25
+
+
+def test_plan_with_offset_intervals():
+    intervals = generate_intervals(10)
+    for interval in intervals:
+        interval["start"] += 100.0
+        interval["end"] += 100.0
+
+    assert len(SegmentPlanner(intervals).plan(4)) == 4
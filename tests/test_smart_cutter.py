@@ -0,0 +1,80 @@
+import random
+from fractions import Fraction
+
+import pytest
+
+from silence_remover.media_editor import SmartCutter
+
+TIME_BASE = Fraction(1, 90000)
+FRAME_PTS = 3003
+GOP_SIZE = 48
+
+
+def create_cutter(intervals, frame_count):
+    cutter = SmartCutter("input.mp4", "output.mp4", intervals)
+    cutter.streams = {
+        "v": {"codec_name": "h264", "r_frame_rate": "30000/1001", "time_base": "1/90000"},
+        "a": {}
+    }
+    cutter.keyframes = [i * FRAME_PTS * TIME_BASE for i in range(0, frame_count, GOP_SIZE)]
+
+    return cutter
+
+
+def get_flag(command, flag):
+    return float(command[command.index(flag) + 1])
+
+
+def render_frames(cutter, piece, frame_times):
+    # Mimics FFmpeg, stream copies start at the last keyframe before the seek, decodes start at the seek itself
+    command = cutter.generate_piece_command(piece, "piece.ts")
+    seek, duration = get_flag(command, "-ss"), get_flag(command, "-t")
+
+    if "copy" in command:
+        seek_keyframe = max(keyframe for keyframe in cutter.keyframes if keyframe <= seek)
+        return [time for time in frame_times if seek_keyframe <= time and time - seek < duration]
+
+    return [time for time in frame_times if seek <= time < seek + duration]
+
+
+def generate_intervals(rng, media_duration):
+    intervals = []
+    time = 0.0
+
+    while time < media_duration:
+        duration = min(rng.uniform(0.1, 12.0), media_duration - time)
+        intervals.append({"start": time, "end": time + duration, "silent": rng.random() < 0.3,
+                          "duration": duration})
+        time += duration
+
+    return intervals
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_every_frame_is_rendered_once(seed):
+    rng = random.Random(seed)
+    frame_count = rng.randint(500, 3000)
+    frame_times = [i * FRAME_PTS * TIME_BASE for i in range(frame_count)]
+    intervals = generate_intervals(rng, float(frame_times[-1]))
+
+    cutter = create_cutter(intervals, frame_count)
+    cutter.plan(silent_speed=1.0)
+
+    assert any(piece["mode"] == "copy" for piece in cutter.pieces)
+
+    rendered_frames = [time for piece in cutter.pieces for time in render_frames(cutter, piece, frame_times)]
+    expected_frames = [time for time in frame_times if time < intervals[-1]["end"]]
+
+    assert rendered_frames == expected_frames
+
+
+def test_copies_start_and_end_on_exact_keyframes():
+    cutter = create_cutter([{"start": 0.5, "end": 20.5, "silent": False, "duration": 20.0}], 700)
+    cutter.plan()
+
+    copy_piece = [piece for piece in cutter.pieces if piece["mode"] == "copy"][0]
+    frame_times = [i * FRAME_PTS * TIME_BASE for i in range(700)]
+    copied_frames = render_frames(cutter, copy_piece, frame_times)
+
+    assert copied_frames[0] in cutter.keyframes
+    assert frame_times[frame_times.index(copied_frames[-1]) + 1] in cutter.keyframes